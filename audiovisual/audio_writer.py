@@ -0,0 +1,139 @@
+import queue
+import threading
+import time
+import wave
+from array import array
+from typing import Optional
+
+import numpy as np
+
+
+class StreamingWavWriter:
+    """
+    WAV file written block by block as audio arrives.
+
+    The header is patched on every write, so the file on disk is a valid WAV
+    at all times and complete as soon as the last block is written.
+    """
+
+    def __init__(self, path: str, sample_rate: int, channels: int = 1, sampwidth: int = 2):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames_written = 0
+        self._wav = wave.open(path, "wb")
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(sampwidth)
+        self._wav.setframerate(sample_rate)
+
+    def write(self, block: np.ndarray):
+        """Append a (frames, channels) block of samples in the file's sample width"""
+        self._wav.writeframes(np.ascontiguousarray(block).tobytes())
+        self.frames_written += len(block)
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def stream_to_wav(path: str, sample_rate: int, channels: int, start_event: threading.Event,
+                  duration: Optional[float] = None, stop_event: Optional[threading.Event] = None,
+                  dtype: str = "int16") -> dict:
+    """
+    Record from the default input device straight into a WAV file.
+
+    The input stream's callback only queues each int16 block; this thread
+    writes them out, so memory stays at a few blocks however long the
+    recording runs. Stops after `duration` seconds (trimmed to the exact
+    sample count) or, with duration=None, when stop_event is set.
+
+    Each block's capture time is taken from the device-reported ADC time and
+    mapped onto time.perf_counter(), the clock the screen recorder stamps
+    frames with, so the two can be aligned afterwards.
+
+    Returns:
+        Dict with frames_written, duration, overflows (blocks the device
+        reported as overflowed) and the timing fit: first_sample_time
+        (perf_counter seconds), measured_rate, drift_ppm and latency_ms
+    """
+    import sounddevice as sd
+
+    blocks = queue.Queue()
+    overflows = [0]
+    target = None if duration is None else int(duration * sample_rate)
+    # Per block: samples delivered before it, and perf_counter time of its first sample
+    block_offsets = array('d')
+    block_times = array('d')
+    latencies = array('d')
+    delivered = [0]
+
+    def callback(indata, frames, time_info, status):
+        now = time.perf_counter()
+        if status.input_overflow:
+            overflows[0] += 1
+        # Host APIs that don't report ADC time give 0; assume the block just ended
+        if time_info.inputBufferAdcTime:
+            latency = time_info.currentTime - time_info.inputBufferAdcTime
+        else:
+            latency = frames / sample_rate
+        block_offsets.append(delivered[0])
+        block_times.append(now - latency)
+        latencies.append(latency)
+        delivered[0] += frames
+        blocks.put(indata.copy())
+
+    start_event.wait()
+    with StreamingWavWriter(path, sample_rate, channels, np.dtype(dtype).itemsize) as writer:
+        with sd.InputStream(samplerate=sample_rate, channels=channels, dtype=dtype, callback=callback):
+            while target is None or writer.frames_written < target:
+                if stop_event is not None and stop_event.is_set():
+                    break
+                try:
+                    block = blocks.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if target is not None:
+                    block = block[:target - writer.frames_written]
+                writer.write(block)
+
+        # Open-ended: keep whatever arrived before the stream closed
+        if target is None:
+            while not blocks.empty():
+                writer.write(blocks.get_nowait())
+
+        stats = {
+            "frames_written": writer.frames_written,
+            "duration": writer.frames_written / sample_rate,
+            "overflows": overflows[0],
+        }
+        stats.update(fit_audio_clock(block_offsets, block_times, latencies, sample_rate))
+        return stats
+
+
+def fit_audio_clock(block_offsets, block_times, latencies, sample_rate: int) -> dict:
+    """
+    Least-squares line through (sample offset, capture time) of each block:
+    its intercept is when the first sample was captured and its slope the
+    device's real sample rate against perf_counter.
+    """
+    if not block_times:
+        return {}
+    offsets = np.frombuffer(block_offsets, dtype=np.float64)
+    times = np.frombuffer(block_times, dtype=np.float64)
+    fit = {"first_sample_time": float(times[0]), "latency_ms": round(float(np.mean(latencies)) * 1000, 3)}
+    if len(times) > 1 and offsets[-1] > 0:
+        seconds_per_sample, first_sample_time = np.polyfit(offsets, times, 1)
+        measured_rate = 1.0 / seconds_per_sample
+        fit.update({
+            "first_sample_time": float(first_sample_time),
+            "measured_rate": round(float(measured_rate), 3),
+            "drift_ppm": round(float((measured_rate / sample_rate - 1.0) * 1e6), 1),
+        })
+    return fit
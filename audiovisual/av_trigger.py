@@ -1,24 +1,29 @@
-import pyautogui
-import sounddevice as sd
 import cv2
-import numpy as np
-import imageio
-import wavio
 import datetime
 import threading
 import keyboard
 import time
 import os
+import json
 
-from PIL import Image, ImageDraw, ImageStat
+from PIL import Image, ImageDraw
 from pystray import Icon, MenuItem, Menu
 from plyer import notification
 
 from pynput import mouse
 from PIL import ImageDraw
 
-# load your custom cursor image
-CURSOR_IMG = Image.open("cursor.png")
+from audiovisual.capture_backends import open_capture_backend
+from audiovisual.frame_buffer import FrameRingBuffer
+from audiovisual.overlay import CursorOverlay
+from audiovisual.frame_diff import FrameDiffer
+from audiovisual.frame_scheduler import FrameIndex, FrameScheduler
+from audiovisual.frame_spool import FrameSpool, remove_spool
+from audiovisual.finalize import outputs_from_spool
+from audiovisual.segments import VideoOutput
+from audiovisual.replay_buffer import ReplayBuffer
+from audiovisual.audio_writer import stream_to_wav
+from audiovisual.windows import parse_region
 
 mouse_clicked = False  # global flag
 last_click_time = 0  # timestamp of last click
@@ -30,6 +35,20 @@ RECORD_TIME = 15  # seconds (default)
 SAMPLE_RATE = 48000
 CHANNELS = 1
 SAMPWIDTH = 2
+FPS = 10
+# "mss" (fast shared-memory grab), "pyautogui" (fallback) or "synthetic" (headless)
+CAPTURE_BACKEND = os.getenv("AUTODOCS_CAPTURE_BACKEND", "mss")
+# (left, top, width, height) to record part of the screen; None = full screen.
+# AUTODOCS_CAPTURE_REGION takes "left,top,width,height"
+CAPTURE_REGION = parse_region(os.getenv("AUTODOCS_CAPTURE_REGION", ""))
+OUTPUT_SIZE = None  # (width, height) box frames are downscaled to fit at capture time; None = native
+SKIP_DUPLICATE_FRAMES = True  # don't re-annotate/re-encode unchanged frames; GIF becomes variable-rate
+SPOOL_TO_DISK = False  # always record via the memory-mapped disk spool
+SPOOL_THRESHOLD_SECONDS = 60  # clips longer than this are spooled automatically
+FRAME_BUFFER_DEPTH = 16  # preallocated frame slots between capture and encoder
+FRAME_DROP_POLICY = "drop_oldest"  # or "drop_newest" when the buffer is full
+SEGMENT_SECONDS = 60  # open-ended (start/stop) recordings are cut into files this long
+REPLAY_SECONDS = 30  # history kept by the always-on replay buffer
 
 def notify(title, message):
     notification.notify(
@@ -41,183 +60,291 @@ def notify(title, message):
 from PIL import ImageDraw
 
 
-def record_screen(ts, start_event, duration):
+# Prerendered cursor / click-ring sprites, blended into each frame with NumPy
+CURSOR_OVERLAY = CursorOverlay()
+
+
+def encode_frames(buffer, output, encoder_stats, frame_index, spool=None):
+    """
+    Encoder stage: drain the frame buffer, annotate and write each frame to the
+    MP4/GIF output (rolling segments when segmenting), or (spool mode) to the
+    on-disk frame spool
+    """
+    differ = FrameDiffer() if SKIP_DUPLICATE_FRAMES else None
+    last_written = None
+    last_tick = -1
+
+    while True:
+        item = buffer.pop()
+        if item is None:
+            break  # buffer closed and drained
+
+        try:
+            seq, tick, cursor_x, cursor_y, clicked = item.meta
+
+            # ——— 2a) scheduler slots missed or dropped by the buffer: hold the
+            # previous frame so the constant-rate MP4 stays on wall-clock time
+            if last_written is not None and output is not None:
+                for _ in range(tick - last_tick - 1):
+                    output.write_video(last_written)
+            last_tick = tick
+
+            # Cut a new segment once this slot is past the current one
+            if output is not None:
+                output.maybe_roll(tick, item.timestamp)
+
+            # ——— 2b) nothing changed: repeat the last encoded frame in the
+            # constant-rate MP4 and let the GIF frame run longer. Every frame
+            # goes through the differ so the first one seeds its baseline.
+            overlay_state = (cursor_x, cursor_y, clicked)
+            unchanged = differ is not None and not differ.changed(item.frame, overlay_state)
+            if unchanged and last_written is not None:
+                if output is not None:
+                    output.write_video(last_written)
+                encoder_stats["frames_duplicate"] += 1
+                frame_index.record_encoded(seq, duplicate=True)
+                continue
+
+            # ——— 3) draw cursor (and click highlight) into the slot in place
+            CURSOR_OVERLAY.apply(item.frame, cursor_x, cursor_y, clicked)
+
+            # ——— 4) spool mode: just copy the annotated frame to disk
+            if spool is not None:
+                spool.append(item.frame, item.timestamp)
+                last_written = True
+                encoder_stats["frames_encoded"] += 1
+                frame_index.record_encoded(seq)
+                continue
+
+            # ——— 5) convert & write frame
+            last_written = cv2.cvtColor(item.frame, cv2.COLOR_RGB2BGR)
+            output.write_video(last_written)
+
+            # ——— 6) quantize & append to the GIF as we go, timed by capture time
+            output.append_gif(Image.fromarray(item.frame), item.timestamp)
+            encoder_stats["frames_encoded"] += 1
+            frame_index.record_encoded(seq)
+
+        except Exception as e:
+            print("Error encoding frame:", e)
+        finally:
+            buffer.release(item)
+
+
+def record_screen(ts, start_event, duration, backend=None, write_gif=True,
+                  region=None, output_size=None, spool=False, stop_event=None,
+                  segment_seconds=None, result=None, output_dir=None):
     
-    """Record screen as video first, then convert to GIF"""
-    video_file = f"screen_{ts}.mp4"
-    gif_file = f"screen_{ts}.gif"
+    """
+    Record screen as video, streaming the GIF alongside unless write_gif is False.
+
+    With spool=True frames are only copied to a memory-mapped spool on disk
+    during capture; the MP4 and GIF are built from it afterwards (right here
+    if write_gif is True, otherwise by background finalization).
+
+    With duration=None recording runs until stop_event is set, and
+    segment_seconds cuts the output into rolling <name>_partNNN files.
+    The written segments are stored in result["segments"] if given.
+    Files go to output_dir (default: the current directory).
+    """
+    base_name = os.path.join(output_dir or "", f"screen_{ts}")
+    video_file = f"{base_name}.mp4"
+    spool_file = f"{base_name}.spool"
+    gif_file = f"{base_name}.gif"
+    stats_file = f"{base_name}_capture.json"
+    index_file = f"{base_name}_frames.npz"
     
+    # Open the grabber on this thread (some backends hold per-thread handles)
+    capture = open_capture_backend(backend or CAPTURE_BACKEND,
+                                   region=region or CAPTURE_REGION,
+                                   output_size=output_size or OUTPUT_SIZE)
+    print(f"🎥 Using capture backend: {capture.name}")
+
+    # Output frame dimensions (capture region, downscaled to the output size)
+    screen_width, screen_height = capture.size()
+    print(f"🎥 Capturing {capture.capture_size()[0]}x{capture.capture_size()[1]} "
+          f"-> {screen_width}x{screen_height}")
+    
+    fps = FPS
+    output = None
+    frame_spool = None
+
+    if spool:
+        # Long recordings: bounded-memory spool now, derived outputs later
+        frame_spool = FrameSpool(spool_file, (screen_height, screen_width, 3))
+    else:
+        # MP4 writer, plus the GIF quantized and written as frames arrive
+        # instead of held in memory. When finalization runs in the background
+        # the GIF is derived from the MP4 later.
+        output = VideoOutput(base_name, (screen_width, screen_height), fps,
+                             write_gif=write_gif, segment_seconds=segment_seconds)
+
+    # Capture (this thread) pushes into a preallocated ring buffer; the encoder
+    # thread drains it so a slow encode never delays the next grab
+    buffer = FrameRingBuffer(FRAME_BUFFER_DEPTH, (screen_height, screen_width, 3),
+                             drop_policy=FRAME_DROP_POLICY)
+    encoder_stats = {"frames_encoded": 0, "frames_duplicate": 0}
+    frame_index = FrameIndex(fps)
+    encoder_thread = threading.Thread(target=encode_frames,
+                                      args=(buffer, output, encoder_stats,
+                                            frame_index, frame_spool),
+                                      daemon=True)
+    encoder_thread.start()
+
     # Wait for the start signal for the audio recording
     start_event.wait()
     
     start_time = time.perf_counter()
-    fps = 10
-    frame_interval = 1.0 / fps
-    next_capture_time = start_time
+    scheduler = FrameScheduler(fps, start_time, duration)
 
     print(f"🎥 Screen recording started at: {start_time}")
     
-    # Get screen dimensions
-    screen_width, screen_height = pyautogui.size()
-    
-    # Initialize video writer
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    video_writer = cv2.VideoWriter(video_file, fourcc, fps, (screen_width, screen_height))
-    
-    frames_for_gif = []
-    
-    while (time.perf_counter() - start_time) < duration:
+    while True:
+        # Sleep until the next slot; slots we were too late for are skipped
+        # (and recorded) rather than captured in a catch-up burst
+        tick = scheduler.wait_next()
+        if tick is None or (stop_event is not None and stop_event.is_set()):
+            break
         now = time.perf_counter()
-        if now < next_capture_time:
-            time.sleep(0.005)
-            continue
-        next_capture_time += frame_interval
+        seq = frame_index.record_capture(tick, now - start_time)
+
+        reserved = buffer.acquire()
+        if reserved is None:
+            continue  # buffer full under drop_newest (indexed as dropped)
+        slot, frame = reserved
 
         try:
-            # ——— 1) grab a fresh screenshot
-            screenshot = pyautogui.screenshot()
-            screen_w, screen_h = screenshot.size
-
-            # ——— 2) get the real mouse position
-            cursor_x, cursor_y = pyautogui.position()
-            # clamp into bounds just in case
-            cursor_x = max(0, min(cursor_x, screen_w - 1))
-            cursor_y = max(0, min(cursor_y, screen_h - 1))
-
-            draw = ImageDraw.Draw(screenshot)
-
-            # ——— 3a) sample a small region around the cursor to decide light vs dark background
-            sample_size = 9
-            left = max(0, cursor_x - sample_size//2)
-            upper = max(0, cursor_y - sample_size//2)
-            right = min(screen_w, left + sample_size)
-            lower = min(screen_h, upper + sample_size)
-            region = screenshot.crop((left, upper, right, lower)).convert("L")
-            mean_lum = ImageStat.Stat(region).mean[0]
-
-            # if background is bright, draw black cursor; if dark, draw white
-            if mean_lum > 160:
-                fill_col = "black"
-                outline_col = "white"
-            else:
-                fill_col = "white"
-                outline_col = "black"         
-
-            # ——— 3b) define a Windows‑style arrow (proper shape)
-            arrow = [
-                (cursor_x, cursor_y),                    # tip
-                (cursor_x + 3, cursor_y + 15),          # left side down
-                (cursor_x + 8, cursor_y + 12),          # notch left
-                (cursor_x + 12, cursor_y + 18),         # bottom left
-                (cursor_x + 15, cursor_y + 16),         # bottom right
-                (cursor_x + 11, cursor_y + 8),          # notch right (moved right and up)
-                (cursor_x + 17, cursor_y + 2),          # right side (moved right and up)
-                (cursor_x, cursor_y),                    # back to tip (close polygon)
-            ]
-
-            # draw the outline slightly thicker for visibility
-            draw.polygon(arrow, fill=outline_col, width=2)
-            # draw the inner fill
-            draw.polygon(arrow, fill=fill_col, outline=outline_col, width=1)
-
-            # ——— 4) draw click‑highlight if we saw a click
-            if 0 < last_click_time and (time.perf_counter() - last_click_time) < click_duration:
-                O = 20
-
-                # make sure our image is RGBA
-                base = screenshot.convert("RGBA")
-
-                # create a transparent overlay
-                overlay = Image.new("RGBA", base.size, (0, 0, 0, 0))
-                od = ImageDraw.Draw(overlay)
-
-                # draw semi‑transparent yellow fill
-                #    (255,255,0,128) → yellow at 50% opacity
-                # Adjust the highlight to be centered on the arrow
-                arrow_center_x = sum([point[0] for point in arrow]) // len(arrow)
-                arrow_center_y = sum([point[1] for point in arrow]) // len(arrow)
-
-                bbox = [(arrow_center_x - O, arrow_center_y - O), (arrow_center_x + O, arrow_center_y + O)]
-                od.ellipse(bbox, fill=(255, 255, 0, 128))
-
-                # composite the overlay onto the frame
-                composed = Image.alpha_composite(base, overlay)
-
-                # draw the red outline on top
-                draw2 = ImageDraw.Draw(composed)
-                draw2.ellipse(bbox, outline="red", width=4)
-
-                # convert back to RGB for your video writer
-                screenshot = composed.convert("RGB")
+            # ——— 1) grab a fresh screenshot straight into the buffer slot
+            capture.grab_into(frame)
 
-            # ——— 5) convert & write frame
-            frame_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-            video_writer.write(frame_cv)
-            frames_for_gif.append(screenshot)
+            # ——— 2) get the real mouse position and click state at grab time
+            cursor_x, cursor_y = capture.cursor_position()
+            clicked = 0 < last_click_time and (time.perf_counter() - last_click_time) < click_duration
+
+            buffer.commit(slot, now, (seq, tick, cursor_x, cursor_y, clicked))
 
         except Exception as e:
+            buffer.cancel(slot)
             print("Error capturing frame:", e)
             continue
 
-    # Release video writer
-    video_writer.release()
-    
+    capture.close()
     end_time = time.perf_counter()
+
+    # Let the encoder drain whatever is still queued, then finish both outputs
+    buffer.close()
+    encoder_thread.join()
+    if output is not None:
+        output.close(end_time)
+    if frame_spool is not None:
+        frame_spool.close(start_time, end_time)
+
     actual_duration = end_time - start_time
-    print(f"🎥 Screen recording completed. Duration: {actual_duration:.2f}s, Frames: {len(frames_for_gif)}")
-    print(f"🎥 Video saved: {video_file}")
-    
-    # Convert to GIF
+    frame_index.missed_slots = scheduler.missed_slots
+    capture_stats = buffer.stats()
+    capture_stats.update(encoder_stats)
+    capture_stats.update(frame_index.stats())
+    capture_stats.update({"backend": capture.name, "fps": fps, "duration": round(actual_duration, 3),
+                          "capture_region": list(capture.bounds),
+                          "output_size": [screen_width, screen_height],
+                          # Frame timestamps are seconds after this perf_counter() reading
+                          "start_clock": start_time})
+    if output is not None and segment_seconds:
+        capture_stats["segments"] = output.segments
+    print(f"🎥 Screen recording completed. Duration: {actual_duration:.2f}s, Frames: {encoder_stats['frames_encoded']} "
+          f"(+{encoder_stats['frames_duplicate']} unchanged)")
+    print(f"🎥 Frame buffer: depth {capture_stats['capacity']} ({capture_stats['drop_policy']}), "
+          f"high-water {capture_stats['high_water_mark']}, dropped {capture_stats['frames_dropped']}")
+    if "real_fps" in capture_stats:
+        print(f"🎥 Timing: {capture_stats['real_fps']} fps real, jitter {capture_stats['jitter_ms']} ms, "
+              f"{capture_stats['slots_missed']} slots missed")
+    if frame_spool is not None:
+        print(f"🎥 Spooled {frame_spool.count} frames to: {spool_file}")
+    else:
+        for segment in output.segments:
+            print(f"🎥 Video saved: {segment['video_file']}")
+            if segment["gif_file"]:
+                print(f"🎥 GIF created: {segment['gif_file']}")
+
     try:
-        print(f"🎥 Converting video to GIF...")
-        imageio.mimsave(gif_file, frames_for_gif, duration=frame_interval, loop=0)
-        print(f"🎥 GIF created: {gif_file}")
+        with open(stats_file, "w", encoding="utf-8") as f:
+            json.dump(capture_stats, f, indent=2)
     except Exception as e:
-        print(f"Error creating GIF: {e}")
-        
+        print(f"Error saving capture stats: {e}")
+
+    # Per-frame timestamp / drop index for seeking and timing analysis
+    try:
+        frame_index.save(index_file)
+    except Exception as e:
+        print(f"Error saving frame index: {e}")
+
+    # Spool without background finalization: build the outputs now
+    if frame_spool is not None and write_gif:
+        print(f"🎥 Building video and GIF from spool...")
+        outputs_from_spool(spool_file, video_file, gif_file, fps)
+        remove_spool(spool_file)
+        print(f"🎥 Video saved: {video_file}")
+        print(f"🎥 GIF created: {gif_file}")
+
+    if result is not None:
+        result["segments"] = output.segments if output is not None else [
+            {"video_file": video_file, "gif_file": gif_file}]
+        result["start_time"] = start_time
     return gif_file
 
 
-def record_audio(ts, start_event, duration):
-    """Records audio and saves as WAV"""
-    wav_file = f"audio_{ts}.wav"
+def record_audio(ts, start_event, duration, stop_event=None, result=None, output_dir=None):
+    """
+    Records audio to a WAV in output_dir, streaming int16 blocks to disk as
+    they arrive (duration=None: until stop_event is set). The stream's
+    timing stats (see stream_to_wav) are stored in `result` if given.
+    """
+    wav_file = os.path.join(output_dir or "", f"audio_{ts}.wav")
     print(f"🎵 Audio recording ready, waiting for start signal...")
     
     try:
-        # Wait for the start signal
-        start_event.wait()
-        
-        start_time = time.perf_counter()
-        print(f"🎵 Audio recording started at: {start_time}")
-        
-        audio = sd.rec(int(duration * SAMPLE_RATE), samplerate=SAMPLE_RATE, channels=CHANNELS)
-        sd.wait()
-        
-        end_time = time.perf_counter()
-        actual_duration = end_time - start_time
-        print(f"🎵 Audio recording completed. Duration: {actual_duration:.2f}s")
-        
-        wavio.write(wav_file, audio, SAMPLE_RATE, sampwidth=SAMPWIDTH)
+        stats = stream_to_wav(wav_file, SAMPLE_RATE, CHANNELS, start_event, duration, stop_event,
+                              dtype=f"int{SAMPWIDTH * 8}")
+        print(f"🎵 Audio recording completed. Duration: {stats['duration']:.2f}s, "
+              f"{stats['overflows']} input overflows")
+        if result is not None:
+            result.update(stats)
         print(f"🎵 Audio recorded: {wav_file}")
     except Exception as e:
         print(f"Error recording audio: {e}")
         
     return wav_file
 
-def record(duration=None, status_callback=None):
-    if duration is None:
-        duration = RECORD_TIME
-    
+
+def start_recording(duration=None, capture_backend=None, write_gif=True, region=None,
+                    output_size=None, spool=False, segment_seconds=None, output_dir=None):
+    """
+    Start recording screen and audio in the background, into output_dir
+    (default: the current directory).
+
+    With duration=None the recording runs until stop_recording() and is cut
+    into rolling segments of segment_seconds (default SEGMENT_SECONDS).
+
+    Returns:
+        Recording handle for stop_recording()
+    """
+    if duration is None and segment_seconds is None:
+        segment_seconds = SEGMENT_SECONDS
+
     ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     print(f"🔴 Starting recording session: {ts}")
 
-    if status_callback:
-        status_callback("🔴 Recording started...")
-
     start_event = threading.Event()
+    stop_event = threading.Event()
+    screen_result = {}
+    audio_result = {}
     
-    screen_thread = threading.Thread(target=record_screen, args=(ts, start_event, duration))
-    audio_thread = threading.Thread(target=record_audio, args=(ts, start_event, duration))
+    screen_thread = threading.Thread(target=record_screen, args=(ts, start_event, duration, capture_backend, write_gif,
+                                                                      region, output_size, spool, stop_event,
+                                                                      segment_seconds, screen_result,
+                                                                      output_dir))
+    audio_thread = threading.Thread(target=record_audio, args=(ts, start_event, duration, stop_event,
+                                                                audio_result, output_dir))
     
     screen_thread.start()
     audio_thread.start()
@@ -225,6 +352,120 @@ def record(duration=None, status_callback=None):
     time.sleep(0.1)
     start_event.set()
 
+    return {
+        "timestamp": ts,
+        "duration": duration,
+        "spool": spool,
+        "write_gif": write_gif,
+        "output_dir": output_dir,
+        "stop_event": stop_event,
+        "threads": (screen_thread, audio_thread),
+        "screen_result": screen_result,
+        "audio_result": audio_result,
+    }
+
+
+def measure_av_sync(screen_result, audio_result):
+    """
+    Offset and drift between the audio device and the frame loop, both
+    measured on time.perf_counter().
+
+    offset_ms is when the first audio sample was captured relative to the
+    video's time zero (frame timestamps in the frame index count from there);
+    audio sample n plays at video time offset + n / audio_rate_measured.
+    """
+    if "start_time" not in screen_result or "first_sample_time" not in audio_result:
+        return None
+    sync = {
+        "clock": "perf_counter",
+        "offset_ms": round((audio_result["first_sample_time"] - screen_result["start_time"]) * 1000, 3),
+        "audio_latency_ms": audio_result.get("latency_ms"),
+        "audio_rate_nominal": SAMPLE_RATE,
+    }
+    if "measured_rate" in audio_result:
+        sync["audio_rate_measured"] = audio_result["measured_rate"]
+        sync["audio_drift_ppm"] = audio_result["drift_ppm"]
+    return sync
+
+
+def stop_recording(handle, wait_only=False):
+    """
+    Stop a recording started with start_recording() and wait for its files.
+
+    Args:
+        handle: Handle returned by start_recording()
+        wait_only: Don't stop early, just wait for a fixed duration to end
+
+    Returns:
+        Dict with the timestamp and the video, GIF and audio file names
+        (in the recording's output_dir); `segments` lists every video/GIF
+        pair when the recording was segmented.
+    """
+    if not wait_only:
+        handle["stop_event"].set()
+    for thread in handle["threads"]:
+        thread.join()
+
+    ts = handle["timestamp"]
+    base_name = os.path.join(handle.get("output_dir") or "", f"screen_{ts}")
+    stats_file = f"{base_name}_capture.json"
+
+    # Measured A/V offset/drift, kept with the capture stats
+    av_sync = measure_av_sync(handle["screen_result"], handle["audio_result"])
+    if av_sync is not None:
+        print(f"⏱️ A/V offset {av_sync['offset_ms']} ms, audio drift {av_sync.get('audio_drift_ppm')} ppm")
+        try:
+            with open(stats_file, "r", encoding="utf-8") as f:
+                capture_stats = json.load(f)
+            capture_stats["av_sync"] = av_sync
+            with open(stats_file, "w", encoding="utf-8") as f:
+                json.dump(capture_stats, f, indent=2)
+        except Exception as e:
+            print(f"Error saving A/V sync: {e}")
+
+    segments = handle["screen_result"].get("segments") or [
+        {"video_file": f"{base_name}.mp4", "gif_file": f"{base_name}.gif"}]
+    return {
+        "timestamp": ts,
+        "video_file": segments[0]["video_file"],
+        "gif_file": segments[0]["gif_file"] or f"{base_name}.gif",
+        "audio_file": os.path.join(handle.get("output_dir") or "", f"audio_{ts}.wav"),
+        "segments": segments,
+        "capture_stats_file": stats_file,
+        "frame_index_file": f"{base_name}_frames.npz",
+        "av_sync": av_sync,
+        # Left for background finalization to build the MP4/GIF from
+        "spool_file": f"{base_name}.spool" if handle["spool"] and not handle["write_gif"] else None,
+        "fps": FPS,
+    }
+
+
+def record(duration=None, status_callback=None, capture_backend=None, write_gif=True,
+           region=None, output_size=None, spool=None, output_dir=None):
+    """
+    Record screen and audio for `duration` seconds into output_dir (default:
+    the current directory).
+
+    Returns:
+        Dict with the timestamp and the video, GIF and audio file names
+        (in output_dir). With write_gif=False the GIF is
+        not produced here and is left to background finalization.
+        `region` and `output_size` limit and downscale the screen capture.
+        `spool` records frames to a disk spool (see record_screen); by default
+        it is used for clips longer than SPOOL_THRESHOLD_SECONDS.
+    """
+    if duration is None:
+        duration = RECORD_TIME
+    if spool is None:
+        spool = SPOOL_TO_DISK or duration > SPOOL_THRESHOLD_SECONDS
+
+    if status_callback:
+        status_callback("🔴 Recording started...")
+
+    handle = start_recording(duration, capture_backend, write_gif, region, output_size, spool,
+                             output_dir=output_dir)
+    ts = handle["timestamp"]
+
     if status_callback:
         for i in range(duration, 0, -1):
             status_callback(f"⏳ {i} seconds remaining...")
@@ -244,8 +485,7 @@ def record(duration=None, status_callback=None):
     spinner_thread.start()
 
     # Wait for recordings to finish
-    screen_thread.join()
-    audio_thread.join()
+    files = stop_recording(handle, wait_only=True)
 
     # Stop spinner
     loading = False
@@ -256,6 +496,55 @@ def record(duration=None, status_callback=None):
 
     print(f"✅ Recording session complete: screen_{ts}.mp4, screen_{ts}.gif & audio_{ts}.wav")
 
+    return files
+
+
+# Open-ended recording toggled from the hotkey / tray, and the optional
+# always-on replay buffer
+active_recording = None
+recording_lock = threading.Lock()
+replay_buffer = None
+
+
+def toggle_recording():
+    """Start an open-ended segmented recording, or stop the one running"""
+    global active_recording
+    with recording_lock:
+        if active_recording is None:
+            active_recording = start_recording()
+            notify("Recording", "Recording started. Press Ctrl+Shift+R again to stop.")
+            return
+        handle, active_recording = active_recording, None
+
+    files = stop_recording(handle)
+    print(f"✅ Recording session complete: {len(files['segments'])} segment(s) & {files['audio_file']}")
+    notify("Recording saved", f"{len(files['segments'])} segment(s) saved")
+
+
+def toggle_replay_buffer():
+    """Start or stop keeping the last REPLAY_SECONDS in memory"""
+    global replay_buffer
+    if replay_buffer is not None:
+        replay_buffer.stop()
+        replay_buffer = None
+        return
+    replay_buffer = ReplayBuffer(REPLAY_SECONDS, fps=FPS, sample_rate=SAMPLE_RATE, channels=CHANNELS,
+                                 backend=CAPTURE_BACKEND, region=CAPTURE_REGION, output_size=OUTPUT_SIZE,
+                                 click_state=lambda: 0 < last_click_time and
+                                 (time.perf_counter() - last_click_time) < click_duration)
+    replay_buffer.start()
+
+
+def save_replay():
+    """Save the replay buffer's last REPLAY_SECONDS as a clip"""
+    if replay_buffer is None:
+        notify("Replay buffer", "Replay buffer is not running")
+        return None
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    files = replay_buffer.save(ts)
+    notify("Replay saved", f"Last {REPLAY_SECONDS} seconds saved")
+    return files
+
 
 def create_image():
     """Creates a basic icon image for tray"""
@@ -280,16 +569,31 @@ def setup_tray():
     def record_20_seconds(icon, item):
         threading.Thread(target=record, args=(20,), daemon=True).start()
 
+    def start_stop(icon, item):
+        threading.Thread(target=toggle_recording, daemon=True).start()
+
+    def replay_toggle(icon, item):
+        toggle_replay_buffer()
+
+    def replay_save(icon, item):
+        threading.Thread(target=save_replay, daemon=True).start()
+
     icon.icon = create_image()
     icon.menu = Menu(
+        MenuItem(lambda item: 'Stop recording' if active_recording else 'Start recording', start_stop),
         MenuItem('Record 10 seconds', record_10_seconds),
         MenuItem('Record 15 seconds', record_15_seconds),
         MenuItem('Record 20 seconds', record_20_seconds),
+        MenuItem(f'Replay buffer ({REPLAY_SECONDS}s)', replay_toggle,
+                 checked=lambda item: replay_buffer is not None),
+        MenuItem(f'Save last {REPLAY_SECONDS} seconds', replay_save,
+                 enabled=lambda item: replay_buffer is not None),
         MenuItem('Quit', quit_app)
     )
 
-    # Start listening for hotkey (defaults to 15 seconds)
+    # Start listening for hotkeys: start/stop recording, save the replay buffer
     keyboard.add_hotkey('ctrl+shift+r', on_hotkey)
+    keyboard.add_hotkey('ctrl+shift+s', lambda: threading.Thread(target=save_replay, daemon=True).start())
 
     icon.run()
 
@@ -304,8 +608,8 @@ def on_click(x, y, button, pressed):
         mouse_clicked = False
 
 def on_hotkey():
-    """Handle hotkey press for recording"""
-    threading.Thread(target=record, args=(15,), daemon=True).start()
+    """Handle hotkey press: start or stop an open-ended recording"""
+    threading.Thread(target=toggle_recording, daemon=True).start()
 
 # MAIN
 if __name__ == '__main__':
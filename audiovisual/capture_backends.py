@@ -0,0 +1,258 @@
+import os
+import time
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+Region = Tuple[int, int, int, int]  # (left, top, width, height) in screen pixels
+
+
+def fit_within(width: int, height: int, max_size: Optional[Tuple[int, int]]) -> Tuple[int, int]:
+    """
+    Scale (width, height) down to fit inside max_size, keeping the aspect ratio.
+    Never upscales; dimensions are rounded to even numbers for the video encoder.
+    """
+    if not max_size:
+        return width, height
+    scale = min(1.0, max_size[0] / width, max_size[1] / height)
+    out_w = max(2, int(width * scale) // 2 * 2)
+    out_h = max(2, int(height * scale) // 2 * 2)
+    return out_w, out_h
+
+
+class CaptureBackend:
+    """
+    Base class for screen capture backends used by av_trigger.record_screen.
+
+    A backend is opened on the thread that will call grab() (some native
+    grabbers keep per-thread display handles) and returns frames as RGB
+    uint8 numpy arrays of shape (height, width, 3).
+
+    Capture can be limited to a screen `region` and downscaled at grab time
+    to fit `output_size`, so the rest of the pipeline only ever handles the
+    smaller frames.
+    """
+
+    name = "base"
+
+    def __init__(self, region: Optional[Region] = None,
+                 output_size: Optional[Tuple[int, int]] = None):
+        self.region = region
+        self.output_size = output_size
+        self._bounds = None  # (left, top, width, height) actually captured
+
+    def open(self):
+        """Acquire any native resources needed for capturing"""
+
+    def close(self):
+        """Release native resources"""
+
+    @property
+    def bounds(self) -> Region:
+        """(left, top, width, height) of the screen area actually captured"""
+        return self._bounds
+
+    def capture_size(self) -> Tuple[int, int]:
+        """Return the (width, height) of the captured screen area"""
+        return self._bounds[2], self._bounds[3]
+
+    def size(self) -> Tuple[int, int]:
+        """Return the (width, height) of the frames produced by grab()"""
+        return fit_within(*self.capture_size(), self.output_size)
+
+    def grab_raw(self) -> np.ndarray:
+        """Grab the captured area at native resolution as an RGB array"""
+        raise NotImplementedError
+
+    def grab(self) -> np.ndarray:
+        """Grab a single RGB frame at output size"""
+        width, height = self.size()
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        self.grab_into(frame)
+        return frame
+
+    def grab_into(self, out: np.ndarray):
+        """Grab a frame directly into a preallocated (height, width, 3) array"""
+        raw = self.grab_raw()
+        if raw.shape[:2] == out.shape[:2]:
+            np.copyto(out, raw)
+        else:
+            cv2.resize(raw, (out.shape[1], out.shape[0]), dst=out, interpolation=cv2.INTER_AREA)
+
+    def screen_cursor_position(self) -> Tuple[int, int]:
+        """Return the mouse position in screen coordinates"""
+        import pyautogui
+        return pyautogui.position()
+
+    def cursor_position(self) -> Tuple[int, int]:
+        """Return the mouse position relative to (and scaled like) the output frame"""
+        x, y = self.screen_cursor_position()
+        left, top, width, height = self._bounds
+        out_w, out_h = self.size()
+        return int((x - left) * out_w / width), int((y - top) * out_h / height)
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MSSBackend(CaptureBackend):
+    """
+    Fast shared-memory grabber (XShm on X11, BitBlt on Windows) via mss.
+    Copies the BGRA buffer straight into numpy without a PIL round-trip and
+    only grabs the configured region.
+    """
+
+    name = "mss"
+
+    def __init__(self, region: Optional[Region] = None,
+                 output_size: Optional[Tuple[int, int]] = None, monitor: int = 1):
+        super().__init__(region, output_size)
+        self.monitor_index = monitor
+        self._sct = None
+        self._monitor = None
+
+    def open(self):
+        import mss
+        self._sct = mss.mss()
+        if self.region:
+            # Clip the requested rect to the virtual screen spanning all monitors
+            screen = self._sct.monitors[0]
+            left = max(self.region[0], screen["left"])
+            top = max(self.region[1], screen["top"])
+            right = min(self.region[0] + self.region[2], screen["left"] + screen["width"])
+            bottom = min(self.region[1] + self.region[3], screen["top"] + screen["height"])
+            if right <= left or bottom <= top:
+                raise ValueError(f"Capture region {self.region} is off screen")
+            self._monitor = {"left": left, "top": top, "width": right - left, "height": bottom - top}
+        else:
+            self._monitor = self._sct.monitors[self.monitor_index]
+        self._bounds = (self._monitor["left"], self._monitor["top"],
+                        self._monitor["width"], self._monitor["height"])
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+    def _grab_bgra(self) -> np.ndarray:
+        shot = self._sct.grab(self._monitor)
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def grab_raw(self) -> np.ndarray:
+        return cv2.cvtColor(self._grab_bgra(), cv2.COLOR_BGRA2RGB)
+
+    def grab_into(self, out: np.ndarray):
+        bgra = self._grab_bgra()
+        if bgra.shape[:2] != out.shape[:2]:
+            # Downscale the 4-channel buffer first, then convert the small frame
+            bgra = cv2.resize(bgra, (out.shape[1], out.shape[0]), interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB, dst=out)
+
+
+class PyAutoGUIBackend(CaptureBackend):
+    """Portable but slow fallback that goes through pyautogui.screenshot()"""
+
+    name = "pyautogui"
+
+    def open(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+        if self.region:
+            self._bounds = tuple(self.region)
+        else:
+            self._bounds = (0, 0) + tuple(pyautogui.size())
+
+    def grab_raw(self) -> np.ndarray:
+        return np.asarray(self._pyautogui.screenshot(region=self._bounds).convert("RGB"))
+
+
+class SyntheticBackend(CaptureBackend):
+    """
+    Generates moving test frames without touching the display, for headless
+    runs and benchmarking the rest of the recording pipeline.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, region: Optional[Region] = None,
+                 output_size: Optional[Tuple[int, int]] = None,
+                 width: int = 1920, height: int = 1080):
+        super().__init__(region, output_size)
+        self.width = width
+        self.height = height
+        self._t0 = None
+        self._base = None
+
+    def open(self):
+        self._t0 = time.perf_counter()
+        self._bounds = tuple(self.region) if self.region else (0, 0, self.width, self.height)
+        width, height = self.capture_size()
+        ramp = np.linspace(0, 255, width, dtype=np.uint8)
+        self._base = np.empty((height, width, 3), dtype=np.uint8)
+        self._base[:, :, 0] = ramp
+        self._base[:, :, 1] = ramp[::-1]
+        self._base[:, :, 2] = 96
+
+    def grab_raw(self) -> np.ndarray:
+        frame = self._base.copy()
+        # Sweep a bar across the screen so consecutive frames differ
+        elapsed = time.perf_counter() - self._t0
+        x = int(elapsed * 200) % frame.shape[1]
+        frame[:, x:x + 40] = 255
+        return frame
+
+    def screen_cursor_position(self) -> Tuple[int, int]:
+        left, top, width, height = self._bounds
+        elapsed = time.perf_counter() - self._t0
+        return left + int(elapsed * 150) % width, top + height // 2
+
+
+CAPTURE_BACKENDS = {
+    MSSBackend.name: MSSBackend,
+    PyAutoGUIBackend.name: PyAutoGUIBackend,
+    SyntheticBackend.name: SyntheticBackend,
+}
+
+# Backends tried, in order, when the configured one cannot be opened
+FALLBACK_ORDER = [MSSBackend.name, PyAutoGUIBackend.name]
+
+
+def open_capture_backend(name: Optional[str] = None, region: Optional[Region] = None,
+                         output_size: Optional[Tuple[int, int]] = None) -> CaptureBackend:
+    """
+    Create and open a capture backend.
+
+    Args:
+        name: Backend name ("mss", "pyautogui" or "synthetic"). Defaults to the
+              AUTODOCS_CAPTURE_BACKEND environment variable, then "mss".
+        region: Optional (left, top, width, height) screen rect to capture
+        output_size: Optional (width, height) box the frames are downscaled to fit
+
+    Returns:
+        An opened CaptureBackend. If the requested backend is unavailable
+        (e.g. mss not installed) the next one in FALLBACK_ORDER is used.
+    """
+    if name is None:
+        name = os.getenv("AUTODOCS_CAPTURE_BACKEND", MSSBackend.name)
+    if name not in CAPTURE_BACKENDS:
+        raise ValueError(f"Unknown capture backend: {name}")
+
+    candidates = [name] + [n for n in FALLBACK_ORDER if n != name and name != SyntheticBackend.name]
+    last_error = None
+    for candidate in candidates:
+        backend = CAPTURE_BACKENDS[candidate](region=region, output_size=output_size)
+        try:
+            backend.open()
+        except Exception as e:
+            print(f"⚠️ Capture backend '{candidate}' unavailable: {e}")
+            last_error = e
+            continue
+        return backend
+
+    raise RuntimeError(f"No screen capture backend available: {last_error}")
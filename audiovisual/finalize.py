@@ -0,0 +1,204 @@
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+import cv2
+from PIL import Image
+
+from audiovisual.frame_diff import FrameDiffer
+from audiovisual.frame_spool import read_spool, remove_spool
+from audiovisual.gif_writer import StreamingGifWriter
+
+
+# FourCC tried when re-encoding the recorder's fast mp4v output; if the local
+# OpenCV build has no encoder for it the original file is kept as-is
+TRANSCODE_FOURCC = "avc1"
+
+# Max per-channel difference for decoded frames to count as a repeat when
+# deriving the GIF
+GIF_DUPLICATE_TOLERANCE = 12
+
+
+def transcode_video(video_file: str, fourcc: str = TRANSCODE_FOURCC) -> bool:
+    """
+    Re-encode a recorded MP4 in place with a more compact codec.
+
+    Returns:
+        True if the file was replaced, False if the codec is unavailable
+    """
+    cap = cv2.VideoCapture(video_file)
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {video_file}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 10
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    root, ext = os.path.splitext(video_file)
+    tmp_file = f"{root}.transcode{ext}"
+    writer = cv2.VideoWriter(tmp_file, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+    if not writer.isOpened():
+        cap.release()
+        return False
+
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            writer.write(frame)
+    finally:
+        cap.release()
+        writer.release()
+
+    os.replace(tmp_file, video_file)
+    return True
+
+
+def gif_from_video(video_file: str, gif_file: str) -> int:
+    """
+    Derive an animated GIF from a video, streaming frame by frame. Runs of
+    identical frames are merged into one longer GIF frame.
+
+    Returns:
+        Number of frames written
+    """
+    cap = cv2.VideoCapture(video_file)
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {video_file}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 10
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    # Decoded frames carry codec noise, so allow small differences
+    differ = FrameDiffer(tolerance=GIF_DUPLICATE_TOLERANCE)
+    gif_writer = StreamingGifWriter(gif_file, size, 1.0 / fps)
+    index = 0
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if differ.changed(frame):
+                gif_writer.append_timed(Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)), index / fps)
+            index += 1
+        gif_writer.close(index / fps)
+        return gif_writer.frame_count
+    finally:
+        gif_writer.close()
+        cap.release()
+
+
+def outputs_from_spool(spool_file: str, video_file: str, gif_file: str, fps: float,
+                       transcode: bool = True) -> Dict:
+    """
+    Build the MP4 and GIF from a frame spool, reading one mapped window at a time.
+
+    Spooled frames are variable-rate: the GIF keeps each frame's duration and the
+    constant-rate MP4 repeats a frame for as many slots as it stays on screen.
+
+    Returns:
+        Dict with 'transcoded' (written with TRANSCODE_FOURCC) and 'gif_frames'
+    """
+    writer = None
+    transcoded = False
+    gif_writer = None
+    written = 0
+
+    try:
+        for frame, start, end in read_spool(spool_file):
+            if writer is None:
+                size = (frame.shape[1], frame.shape[0])
+                if transcode:
+                    writer = cv2.VideoWriter(video_file, cv2.VideoWriter_fourcc(*TRANSCODE_FOURCC), fps, size)
+                    transcoded = writer.isOpened()
+                if not transcoded:
+                    writer = cv2.VideoWriter(video_file, cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+                gif_writer = StreamingGifWriter(gif_file, size, 1.0 / fps)
+
+            bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            for _ in range(max(1, int(round(end * fps)) - written)):
+                writer.write(bgr)
+                written += 1
+            gif_writer.append(Image.fromarray(frame), end - start)
+    finally:
+        if writer is not None:
+            writer.release()
+        if gif_writer is not None:
+            gif_writer.close()
+
+    return {
+        "transcoded": transcoded,
+        "gif_frames": gif_writer.frame_count if gif_writer is not None else 0,
+    }
+
+
+def finalize_clip(video_file: str, gif_file: str, transcode: bool = True,
+                  spool_file: Optional[str] = None, fps: float = 10) -> Dict:
+    """
+    Finalize a recorded clip: transcode the MP4 and derive the GIF from it, or
+    build both from a frame spool (which is deleted afterwards).
+    Runs in a worker process, so it only takes and returns plain data.
+    """
+    start_time = time.perf_counter()
+    if spool_file:
+        built = outputs_from_spool(spool_file, video_file, gif_file, fps, transcode)
+        remove_spool(spool_file)
+        transcoded, gif_frames = built["transcoded"], built["gif_frames"]
+    else:
+        transcoded = transcode_video(video_file) if transcode else False
+        gif_frames = gif_from_video(video_file, gif_file)
+
+    return {
+        "video_file": video_file,
+        "gif_file": gif_file,
+        "transcoded": transcoded,
+        "gif_frames": gif_frames,
+        "finalize_seconds": round(time.perf_counter() - start_time, 3),
+    }
+
+
+class ClipFinalizer:
+    """
+    Runs finalize_clip in a small process pool so that encoding work for one
+    clip never blocks recording the next one.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, transcode: bool = True):
+        if max_workers is None:
+            max_workers = max(1, min(2, (os.cpu_count() or 2) - 1))
+        self.max_workers = max_workers
+        self.transcode = transcode
+        self._executor = None
+
+    def submit(self, video_file: str, gif_file: str, spool_file: Optional[str] = None,
+               fps: float = 10) -> Future:
+        """Queue a clip for finalization; the returned future yields finalize_clip's dict"""
+        args = (finalize_clip, video_file, gif_file, self.transcode, spool_file, fps)
+        try:
+            future = self._pool().submit(*args)
+        except BrokenProcessPool:
+            # A worker died since the last clip; start over with a fresh pool
+            self._executor = None
+            future = self._pool().submit(*args)
+        executor = self._executor
+
+        def on_done(done_future):
+            if (not done_future.cancelled() and isinstance(done_future.exception(), BrokenProcessPool)
+                    and self._executor is executor):
+                self._executor = None
+
+        future.add_done_callback(on_done)
+        return future
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
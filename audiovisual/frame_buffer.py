@@ -0,0 +1,138 @@
+import threading
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+
+class BufferedFrame:
+    """A frame slot handed to the consumer; call FrameRingBuffer.release() when done"""
+
+    __slots__ = ("slot", "frame", "timestamp", "meta")
+
+    def __init__(self, slot: int, frame: np.ndarray, timestamp: float, meta: Any):
+        self.slot = slot
+        self.frame = frame
+        self.timestamp = timestamp
+        self.meta = meta
+
+
+class FrameRingBuffer:
+    """
+    Bounded, preallocated frame queue between the capture and encoder stages.
+
+    All frame memory is allocated once up front as `capacity` slots. The
+    producer writes into a free slot (acquire/commit) and the consumer reads
+    slots in capture order (pop/release). When every slot is busy the drop
+    policy decides what to lose:
+
+    - "drop_oldest": recycle the oldest queued frame (keeps latency low)
+    - "drop_newest": discard the frame being captured (keeps queued frames)
+    """
+
+    def __init__(self, capacity: int, frame_shape: Tuple[int, ...],
+                 dtype=np.uint8, drop_policy: str = DROP_OLDEST):
+        if capacity < 2:
+            raise ValueError("Frame buffer capacity must be at least 2")
+        if drop_policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+
+        self.capacity = capacity
+        self.drop_policy = drop_policy
+        self._frames = np.empty((capacity,) + tuple(frame_shape), dtype=dtype)
+        self._free = list(range(capacity))
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.pushed = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def acquire(self) -> Optional[Tuple[int, np.ndarray]]:
+        """
+        Reserve a slot for the next frame.
+
+        Returns:
+            (slot, array) to write the frame into, or None if the frame has to
+            be dropped under the "drop_newest" policy.
+        """
+        with self._cond:
+            if self._free:
+                slot = self._free.pop()
+            elif self.drop_policy == DROP_OLDEST and self._queue:
+                slot = self._queue.popleft()[0]
+                self.dropped += 1
+            else:
+                self.dropped += 1
+                return None
+        return slot, self._frames[slot]
+
+    def commit(self, slot: int, timestamp: float, meta: Any = None):
+        """Queue a slot filled via acquire() for the consumer"""
+        with self._cond:
+            self._queue.append((slot, timestamp, meta))
+            self.pushed += 1
+            self.high_water = max(self.high_water, len(self._queue))
+            self._cond.notify()
+
+    def cancel(self, slot: int):
+        """Give back a slot from acquire() that was never filled"""
+        with self._cond:
+            self._free.append(slot)
+
+    def push(self, frame: np.ndarray, timestamp: float, meta: Any = None) -> bool:
+        """Copy a frame into the buffer. Returns False if it was dropped."""
+        reserved = self.acquire()
+        if reserved is None:
+            return False
+        slot, target = reserved
+        np.copyto(target, frame)
+        self.commit(slot, timestamp, meta)
+        return True
+
+    def pop(self, timeout: Optional[float] = None) -> Optional[BufferedFrame]:
+        """
+        Take the oldest queued frame, blocking until one is available.
+
+        Returns None once the buffer is closed and drained, or on timeout.
+        """
+        with self._cond:
+            while not self._queue and not self._closed:
+                if not self._cond.wait(timeout):
+                    return None
+            if not self._queue:
+                return None
+            slot, timestamp, meta = self._queue.popleft()
+        return BufferedFrame(slot, self._frames[slot], timestamp, meta)
+
+    def release(self, item: BufferedFrame):
+        """Return a popped slot to the free list"""
+        with self._cond:
+            self._free.append(item.slot)
+
+    def close(self):
+        """Signal that no more frames will be pushed"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def stats(self) -> Dict:
+        """Queue statistics for reporting alongside a clip"""
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "drop_policy": self.drop_policy,
+                "frames_captured": self.pushed,
+                "frames_dropped": self.dropped,
+                "queue_depth": len(self._queue),
+                "high_water_mark": self.high_water,
+            }
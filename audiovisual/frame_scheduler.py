@@ -0,0 +1,136 @@
+import time
+from array import array
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class FrameScheduler:
+    """
+    Fixed-rate capture clock that never bursts to catch up.
+
+    Slot k is due at start_time + k / fps. If the capture loop stalls past one
+    or more whole slots, those slots are recorded as missed and skipped, and
+    capture resumes on the slot that is current, so the cadence stays locked
+    to wall time instead of firing a burst of late frames.
+    """
+
+    def __init__(self, fps: float, start_time: float, duration: Optional[float] = None):
+        self.interval = 1.0 / fps
+        self.start_time = start_time
+        self.end_time = None if duration is None else start_time + duration
+        self.next_slot = 0
+        self.missed_slots = array('I')
+
+    def slot_time(self, slot: int) -> float:
+        return self.start_time + slot * self.interval
+
+    def wait_next(self) -> Optional[int]:
+        """
+        Sleep until the next slot is due and return its index, or None once
+        the recording duration has been reached.
+        """
+        now = time.perf_counter()
+        due = self.slot_time(self.next_slot)
+
+        if now < due:
+            if self.end_time is not None and due >= self.end_time:
+                return None
+            time.sleep(due - now)
+        else:
+            current = int((now - self.start_time) / self.interval)
+            if current > self.next_slot:
+                self.missed_slots.extend(range(self.next_slot, current))
+                self.next_slot = current
+            if self.end_time is not None and self.slot_time(self.next_slot) >= self.end_time:
+                return None
+
+        slot = self.next_slot
+        self.next_slot += 1
+        return slot
+
+
+# Per-frame status codes stored in the frame index
+FRAME_ENCODED = 0
+FRAME_DUPLICATE = 1
+FRAME_BUFFER_DROPPED = 2
+
+
+class FrameIndex:
+    """
+    Compact, array-backed record of every captured frame: its scheduler slot,
+    its actual capture time (seconds since recording start) and whether it was
+    encoded, skipped as a duplicate or dropped by the frame buffer.
+
+    Saved next to the clip as an .npz, it gives real fps / jitter statistics
+    and lets later stages seek to the frame shown at any moment.
+    """
+
+    def __init__(self, fps: float):
+        self.fps = fps
+        self.slots = array('I')
+        self.timestamps = array('d')
+        self.missed_slots = array('I')
+        self._encoded = array('I')
+        self._duplicates = array('I')
+
+    def record_capture(self, slot: int, timestamp: float) -> int:
+        """Record a captured frame (capture thread); returns its sequence number"""
+        self.slots.append(slot)
+        self.timestamps.append(timestamp)
+        return len(self.slots) - 1
+
+    def record_encoded(self, seq: int, duplicate: bool = False):
+        """Record what the encoder did with a frame (encoder thread)"""
+        (self._duplicates if duplicate else self._encoded).append(seq)
+
+    def status(self) -> np.ndarray:
+        status = np.full(len(self.slots), FRAME_BUFFER_DROPPED, dtype=np.uint8)
+        status[np.frombuffer(self._encoded, dtype=np.uint32)] = FRAME_ENCODED
+        status[np.frombuffer(self._duplicates, dtype=np.uint32)] = FRAME_DUPLICATE
+        return status
+
+    def stats(self) -> Dict:
+        """Real frame rate and timing jitter of the captured frames"""
+        slots = np.frombuffer(self.slots, dtype=np.uint32)
+        timestamps = np.frombuffer(self.timestamps, dtype=np.float64)
+        status = self.status()
+        stats = {
+            "frames_indexed": int(len(slots)),
+            "slots_missed": len(self.missed_slots),
+            "frames_buffer_dropped": int((status == FRAME_BUFFER_DROPPED).sum()),
+        }
+        if len(slots) > 1:
+            lateness = timestamps - slots / self.fps
+            stats.update({
+                "real_fps": round(float((len(slots) - 1) / (timestamps[-1] - timestamps[0])), 2),
+                "jitter_ms": round(float(np.std(np.diff(timestamps))) * 1000, 3),
+                "mean_lateness_ms": round(float(lateness.mean()) * 1000, 3),
+                "max_lateness_ms": round(float(lateness.max()) * 1000, 3),
+            })
+        return stats
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            fps=np.float64(self.fps),
+            slots=np.frombuffer(self.slots, dtype=np.uint32),
+            timestamps=np.frombuffer(self.timestamps, dtype=np.float64),
+            status=self.status(),
+            missed_slots=np.frombuffer(self.missed_slots, dtype=np.uint32),
+        )
+
+    @staticmethod
+    def load(path: str) -> Dict[str, np.ndarray]:
+        """Load a saved index as a dict of arrays"""
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
+
+
+def frame_at(index: Dict[str, np.ndarray], t: float) -> int:
+    """
+    Return the sequence number of the frame on screen at `t` seconds into the
+    recording (the last frame captured at or before t), from a loaded index.
+    """
+    timestamps = index["timestamps"]
+    return max(0, int(np.searchsorted(timestamps, t, side="right")) - 1)
@@ -0,0 +1,103 @@
+import os
+from array import array
+from typing import Iterator, Tuple
+
+import numpy as np
+
+
+class FrameSpool:
+    """
+    Append-only raw frame file on disk for long recordings.
+
+    Frames are copied into a memory-mapped window of `chunk_frames` frames;
+    when the window is full it is flushed and unmapped and the file is grown
+    for the next one, so resident memory stays at one window no matter how
+    long the recording runs. Only changed frames need to be spooled: each
+    frame's timestamp is kept, and it lasts until the next one.
+
+    Layout: <path> holds the raw uint8 frames back to back; <path>.npz holds
+    the frame shape, per-frame timestamps (seconds since start) and duration.
+    """
+
+    def __init__(self, path: str, frame_shape: Tuple[int, ...], chunk_frames: int = 32):
+        self.path = path
+        self.frame_shape = tuple(frame_shape)
+        self.frame_bytes = int(np.prod(self.frame_shape))
+        self.chunk_frames = chunk_frames
+        self.timestamps = array('d')
+        self.count = 0
+
+        self._chunk = None
+        self._chunk_start = 0
+        open(path, "wb").close()
+
+    def _map_next_chunk(self):
+        self._release_chunk()
+        self._chunk_start = self.count
+        with open(self.path, "r+b") as f:
+            f.truncate((self._chunk_start + self.chunk_frames) * self.frame_bytes)
+        self._chunk = np.memmap(self.path, dtype=np.uint8, mode="r+",
+                                offset=self._chunk_start * self.frame_bytes,
+                                shape=(self.chunk_frames,) + self.frame_shape)
+
+    def _release_chunk(self):
+        if self._chunk is not None:
+            self._chunk.flush()
+            del self._chunk
+            self._chunk = None
+
+    def append(self, frame: np.ndarray, timestamp: float):
+        """Copy a frame into the spool"""
+        if self._chunk is None or self.count - self._chunk_start >= self.chunk_frames:
+            self._map_next_chunk()
+        np.copyto(self._chunk[self.count - self._chunk_start], frame)
+        self.timestamps.append(timestamp)
+        self.count += 1
+
+    def close(self, start_time: float, end_time: float):
+        """
+        Flush the spool, trim unused space and write the index.
+
+        Args:
+            start_time: Recording start, subtracted from the frame timestamps
+            end_time: Recording end (how long the last frame lasts)
+        """
+        self._release_chunk()
+        with open(self.path, "r+b") as f:
+            f.truncate(self.count * self.frame_bytes)
+        np.savez(f"{self.path}.npz",
+                 shape=np.array(self.frame_shape),
+                 timestamps=np.frombuffer(self.timestamps, dtype=np.float64) - start_time,
+                 duration=np.float64(end_time - start_time))
+
+
+def read_spool(path: str, chunk_frames: int = 32) -> Iterator[Tuple[np.ndarray, float, float]]:
+    """
+    Iterate over a closed spool one mapped window at a time.
+
+    Yields:
+        (frame, start, end) with the times (seconds) the frame is on screen
+    """
+    with np.load(f"{path}.npz") as meta:
+        shape = tuple(int(n) for n in meta["shape"])
+        timestamps = meta["timestamps"]
+        duration = float(meta["duration"])
+
+    count = len(timestamps)
+    frame_bytes = int(np.prod(shape))
+    ends = np.append(timestamps[1:], max(duration, timestamps[-1] if count else 0.0))
+
+    for start in range(0, count, chunk_frames):
+        n = min(chunk_frames, count - start)
+        window = np.memmap(path, dtype=np.uint8, mode="r", offset=start * frame_bytes,
+                           shape=(n,) + shape)
+        for i in range(n):
+            yield window[i], float(timestamps[start + i]), float(ends[start + i])
+        del window
+
+
+def remove_spool(path: str):
+    """Delete a spool and its index"""
+    for file in (path, f"{path}.npz"):
+        if os.path.exists(file):
+            os.remove(file)
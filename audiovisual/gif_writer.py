@@ -0,0 +1,125 @@
+import struct
+from typing import Optional
+
+from PIL import Image, GifImagePlugin
+
+
+class StreamingGifWriter:
+    """
+    Writes an animated GIF frame by frame.
+
+    Each appended frame is quantized to its own 256-colour palette and written
+    to disk immediately (with a local colour table), so memory use does not
+    grow with clip length and the GIF is complete as soon as close() returns.
+
+    Durations are tracked in milliseconds and rounded to the GIF's 10 ms units
+    with carry-over, so e.g. 30 fps does not drift to 33.3 fps.
+
+    Frames can also be appended with capture timestamps (append_timed) for
+    variable-frame-rate output: each frame is shown until the next one's
+    timestamp, so skipped duplicate frames simply lengthen the previous one.
+    """
+
+    def __init__(self, path: str, size, frame_duration: float, loop: int = 0,
+                 colors: int = 256):
+        """
+        Args:
+            path: Output GIF file
+            size: (width, height) of every frame
+            frame_duration: Default frame duration in seconds
+            loop: Netscape loop count (0 = forever)
+            colors: Palette size used when quantizing each frame
+        """
+        self.path = path
+        self.size = tuple(size)
+        self.frame_duration = frame_duration
+        self.colors = colors
+        self.frame_count = 0
+
+        self._elapsed_ms = 0.0
+        self._written_cs = 0
+        self._pending = None  # (quantized frame, timestamp) awaiting its duration
+        self._fp = open(path, "wb")
+        self._write_header(loop)
+
+    def _write_header(self, loop: int):
+        width, height = self.size
+        # Logical screen descriptor without a global colour table; every frame
+        # carries its own palette
+        self._fp.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+        # Netscape looping extension
+        self._fp.write(b"!\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00")
+
+    def _next_delay_ms(self, duration: float) -> int:
+        """Round the running total to centiseconds so per-frame errors don't accumulate"""
+        self._elapsed_ms += duration * 1000.0
+        target_cs = int(round(self._elapsed_ms / 10.0))
+        delay_cs = max(1, target_cs - self._written_cs)
+        self._written_cs += delay_cs
+        return delay_cs * 10
+
+    def _quantize(self, frame: Image.Image) -> Image.Image:
+        if self._fp is None:
+            raise ValueError("GIF writer is already closed")
+        if frame.size != self.size:
+            frame = frame.resize(self.size)
+        if frame.mode != "RGB":
+            frame = frame.convert("RGB")
+        return frame.quantize(colors=self.colors, method=Image.Quantize.FASTOCTREE,
+                              dither=Image.Dither.NONE)
+
+    def _write(self, quantized: Image.Image, duration: float):
+        delay = self._next_delay_ms(duration)
+        for chunk in GifImagePlugin.getdata(quantized, duration=delay, include_color_table=True):
+            self._fp.write(chunk)
+        self.frame_count += 1
+
+    def append(self, frame: Image.Image, duration: Optional[float] = None):
+        """
+        Quantize and write a frame.
+
+        Args:
+            frame: RGB PIL image of the writer's size
+            duration: How long to show this frame in seconds (default: frame_duration)
+        """
+        self._write(self._quantize(frame), self.frame_duration if duration is None else duration)
+
+    def append_timed(self, frame: Image.Image, timestamp: float):
+        """
+        Quantize a frame captured at `timestamp` (seconds). It is written once
+        the next frame's timestamp (or close()) tells how long it lasts.
+        """
+        quantized = self._quantize(frame)
+        self._flush_pending(timestamp)
+        self._pending = (quantized, timestamp)
+
+    def _flush_pending(self, until: Optional[float]):
+        if self._pending is None:
+            return
+        quantized, timestamp = self._pending
+        duration = self.frame_duration if until is None else max(0.0, until - timestamp)
+        self._write(quantized, duration)
+        self._pending = None
+
+    def close(self, end_time: Optional[float] = None):
+        """
+        Write the GIF trailer and close the file.
+
+        Args:
+            end_time: Timestamp where the last append_timed() frame ends
+                      (default: one frame_duration after it)
+        """
+        if self._fp is None:
+            return
+        try:
+            self._flush_pending(end_time)
+            self._fp.write(b";")
+        finally:
+            self._fp.close()
+            self._fp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
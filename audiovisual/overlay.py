@@ -0,0 +1,122 @@
+from typing import Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+# Windows-style arrow, relative to the cursor tip
+ARROW_POINTS = [
+    (0, 0),    # tip
+    (3, 15),   # left side down
+    (8, 12),   # notch left
+    (12, 18),  # bottom left
+    (15, 16),  # bottom right
+    (11, 8),   # notch right
+    (17, 2),   # right side
+    (0, 0),    # back to tip (close polygon)
+]
+
+# Background luminance above which the dark cursor is used
+LIGHT_BACKGROUND_LUMINANCE = 160
+SAMPLE_SIZE = 9
+
+
+def _split_sprite(image: Image.Image) -> Tuple[np.ndarray, np.ndarray]:
+    """Split an RGBA sprite into premultiplied RGB and inverse alpha (uint16)"""
+    rgba = np.asarray(image, dtype=np.uint16)
+    alpha = rgba[:, :, 3:4]
+    return rgba[:, :, :3] * alpha, 255 - alpha
+
+
+def _render_arrow(fill_col: str, outline_col: str, pad: int) -> Image.Image:
+    width = max(x for x, _ in ARROW_POINTS) + 2 * pad + 1
+    height = max(y for _, y in ARROW_POINTS) + 2 * pad + 1
+    sprite = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    arrow = [(x + pad, y + pad) for x, y in ARROW_POINTS]
+    # outline slightly thicker for visibility, then the inner fill
+    draw.polygon(arrow, fill=outline_col, width=2)
+    draw.polygon(arrow, fill=fill_col, outline=outline_col, width=1)
+    return sprite
+
+
+def _render_click_ring(radius: int) -> Image.Image:
+    size = 2 * radius + 1
+    sprite = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    # semi-transparent yellow fill with an opaque red outline on top
+    draw.ellipse([(0, 0), (size - 1, size - 1)], fill=(255, 255, 0, 128))
+    draw.ellipse([(0, 0), (size - 1, size - 1)], outline="red", width=4)
+    return sprite
+
+
+class CursorOverlay:
+    """
+    Composites the cursor arrow and click highlight onto RGB numpy frames.
+
+    The light/dark arrows and the click ring are rendered once as sprites and
+    alpha-blended with NumPy into just the few pixels around the cursor, so the
+    per-frame cost does not depend on the screen resolution.
+    """
+
+    def __init__(self, ring_radius: int = 20, pad: int = 2):
+        self.pad = pad
+        self.ring_radius = ring_radius
+        # Bright background -> black arrow; dark background -> white arrow
+        self.dark_arrow = _split_sprite(_render_arrow("black", "white", pad))
+        self.light_arrow = _split_sprite(_render_arrow("white", "black", pad))
+        self.click_ring = _split_sprite(_render_click_ring(ring_radius))
+
+        # Highlight is centred on the arrow's vertex average, as before
+        self.ring_offset = (
+            sum(x for x, _ in ARROW_POINTS) // len(ARROW_POINTS),
+            sum(y for _, y in ARROW_POINTS) // len(ARROW_POINTS),
+        )
+
+    @staticmethod
+    def _blend(frame: np.ndarray, sprite: Tuple[np.ndarray, np.ndarray], left: int, top: int):
+        """Alpha-blend a sprite into frame in place, clipped to the frame bounds"""
+        rgb, inv_alpha = sprite
+        height, width = rgb.shape[:2]
+        frame_h, frame_w = frame.shape[:2]
+
+        x0, y0 = max(0, left), max(0, top)
+        x1, y1 = min(frame_w, left + width), min(frame_h, top + height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        sx, sy = x0 - left, y0 - top
+        src = rgb[sy:sy + (y1 - y0), sx:sx + (x1 - x0)]
+        inv = inv_alpha[sy:sy + (y1 - y0), sx:sx + (x1 - x0)]
+        region = frame[y0:y1, x0:x1]
+        region[...] = (src + region * inv + 127) // 255
+
+    def background_luminance(self, frame: np.ndarray, x: int, y: int) -> float:
+        """Mean ITU-R 601 luma of a small patch under the cursor"""
+        frame_h, frame_w = frame.shape[:2]
+        left = max(0, x - SAMPLE_SIZE // 2)
+        upper = max(0, y - SAMPLE_SIZE // 2)
+        patch = frame[upper:min(frame_h, upper + SAMPLE_SIZE),
+                      left:min(frame_w, left + SAMPLE_SIZE)].reshape(-1, 3)
+        if patch.size == 0:
+            return 0.0
+        return float(patch.mean(axis=0) @ (0.299, 0.587, 0.114))
+
+    def apply(self, frame: np.ndarray, cursor_x: int, cursor_y: int, clicked: bool):
+        """Draw the cursor (and click highlight) onto an RGB frame in place"""
+        frame_h, frame_w = frame.shape[:2]
+        # clamp into bounds just in case
+        cursor_x = max(0, min(cursor_x, frame_w - 1))
+        cursor_y = max(0, min(cursor_y, frame_h - 1))
+
+        if self.background_luminance(frame, cursor_x, cursor_y) > LIGHT_BACKGROUND_LUMINANCE:
+            arrow = self.dark_arrow
+        else:
+            arrow = self.light_arrow
+        self._blend(frame, arrow, cursor_x - self.pad, cursor_y - self.pad)
+
+        if clicked:
+            center_x = cursor_x + self.ring_offset[0]
+            center_y = cursor_y + self.ring_offset[1]
+            self._blend(frame, self.click_ring,
+                        center_x - self.ring_radius, center_y - self.ring_radius)
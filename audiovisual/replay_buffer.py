@@ -0,0 +1,197 @@
+import threading
+import time
+import wave
+from collections import deque
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from audiovisual.capture_backends import open_capture_backend
+from audiovisual.frame_diff import FrameDiffer
+from audiovisual.frame_scheduler import FrameScheduler
+from audiovisual.gif_writer import StreamingGifWriter
+from audiovisual.overlay import CursorOverlay
+
+
+class ReplayBuffer:
+    """
+    Always-on capture that keeps only the last `seconds` of screen and audio,
+    so a moment can be saved after it happened ("replay last N seconds").
+
+    Changed frames are kept JPEG-compressed in memory with their timestamps
+    (static stretches cost nothing) and audio goes into a fixed int16 ring,
+    so memory stays bounded however long the buffer runs.
+    """
+
+    def __init__(self, seconds: float = 30, fps: float = 10, sample_rate: int = 48000,
+                 channels: int = 1, backend: Optional[str] = None, region=None,
+                 output_size=None, jpeg_quality: int = 85, click_state=None):
+        """
+        Args:
+            seconds: How much history to keep
+            fps: Capture rate while buffering
+            sample_rate, channels: Audio format
+            backend, region, output_size: Passed to open_capture_backend
+            jpeg_quality: Compression of the buffered frames
+            click_state: Optional callable returning True while a click highlight should show
+        """
+        self.seconds = seconds
+        self.fps = fps
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.backend = backend
+        self.region = region
+        self.output_size = output_size
+        self.jpeg_quality = jpeg_quality
+        self.click_state = click_state or (lambda: False)
+
+        self._frames = deque()  # (timestamp, jpeg bytes)
+        self._frames_lock = threading.Lock()
+        self._audio = np.zeros((int(seconds * sample_rate), channels), dtype=np.int16)
+        self._audio_written = 0  # total samples ever written
+        self._audio_lock = threading.Lock()
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._stream = None
+        self._size = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start buffering screen and audio in the background"""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+        self._start_audio()
+        print(f"⏺️ Replay buffer running (last {self.seconds}s)")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def _start_audio(self):
+        try:
+            import sounddevice as sd
+        except Exception as e:
+            print(f"⚠️ Replay buffer without audio: {e}")
+            return
+
+        def callback(indata, frames, time_info, status):
+            self._write_audio(indata)
+
+        self._stream = sd.InputStream(samplerate=self.sample_rate, channels=self.channels,
+                                      dtype="int16", callback=callback)
+        self._stream.start()
+
+    def _write_audio(self, block: np.ndarray):
+        with self._audio_lock:
+            capacity = len(self._audio)
+            block = block[-capacity:]
+            start = self._audio_written % capacity
+            first = min(len(block), capacity - start)
+            self._audio[start:start + first] = block[:first]
+            self._audio[:len(block) - first] = block[first:]
+            self._audio_written += len(block)
+
+    def _capture_loop(self):
+        overlay = CursorOverlay()
+        differ = FrameDiffer()
+        # open_capture_backend() has already opened the backend; just close it at the end
+        capture = open_capture_backend(self.backend, self.region, self.output_size)
+        try:
+            self._size = capture.size()
+            frame = np.empty((self._size[1], self._size[0], 3), dtype=np.uint8)
+            scheduler = FrameScheduler(self.fps, time.perf_counter())
+            encode_params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+
+            while not self._stop_event.is_set():
+                scheduler.wait_next()
+                now = time.perf_counter()
+                try:
+                    capture.grab_into(frame)
+                    cursor_x, cursor_y = capture.cursor_position()
+                    clicked = self.click_state()
+                    if differ.changed(frame, (cursor_x, cursor_y, clicked)):
+                        overlay.apply(frame, cursor_x, cursor_y, clicked)
+                        ok, jpeg = cv2.imencode(".jpg", cv2.cvtColor(frame, cv2.COLOR_RGB2BGR), encode_params)
+                        if ok:
+                            with self._frames_lock:
+                                self._frames.append((now, jpeg.tobytes()))
+                except Exception as e:
+                    print("Error buffering frame:", e)
+
+                # Forget frames older than the window, but keep the one on
+                # screen at the start of the window
+                with self._frames_lock:
+                    while len(self._frames) > 1 and self._frames[1][0] <= now - self.seconds:
+                        self._frames.popleft()
+        finally:
+            capture.close()
+
+    def save(self, ts: str) -> Dict:
+        """
+        Write the buffered history to screen_<ts>.mp4/.gif and audio_<ts>.wav.
+
+        Returns:
+            Dict with the written file names
+        """
+        end = time.perf_counter()
+        with self._frames_lock:
+            frames = list(self._frames)
+        # Less history than the window if the buffer hasn't been running that long
+        start = max(end - self.seconds, frames[0][0]) if frames else end - self.seconds
+        with self._audio_lock:
+            capacity = len(self._audio)
+            count = min(self._audio_written, capacity)
+            head = self._audio_written % capacity
+            audio = np.concatenate([self._audio[head:], self._audio[:head]])[capacity - count:]
+
+        files = {
+            "timestamp": ts,
+            "video_file": f"screen_{ts}.mp4",
+            "gif_file": f"screen_{ts}.gif",
+            "audio_file": f"audio_{ts}.wav",
+        }
+
+        if frames:
+            size = self._size
+            video_writer = cv2.VideoWriter(files["video_file"], cv2.VideoWriter_fourcc(*'mp4v'), self.fps, size)
+            gif_writer = StreamingGifWriter(files["gif_file"], size, 1.0 / self.fps)
+            written = 0
+            try:
+                for i, (timestamp, jpeg) in enumerate(frames):
+                    frame_end = frames[i + 1][0] if i + 1 < len(frames) else end
+                    if frame_end <= start:
+                        continue
+                    frame_start = max(timestamp, start)
+                    bgr = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+                    for _ in range(max(1, int(round((frame_end - start) * self.fps)) - written)):
+                        video_writer.write(bgr)
+                        written += 1
+                    gif_writer.append(Image.fromarray(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)),
+                                      frame_end - frame_start)
+            finally:
+                video_writer.release()
+                gif_writer.close()
+
+        with wave.open(files["audio_file"], "wb") as wav:
+            wav.setnchannels(self.channels)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(audio.tobytes())
+
+        print(f"⏺️ Saved last {self.seconds}s: {files['video_file']}, {files['gif_file']} & {files['audio_file']}")
+        return files
@@ -0,0 +1,85 @@
+from typing import Dict, List, Optional
+
+import cv2
+from PIL import Image
+
+from audiovisual.gif_writer import StreamingGifWriter
+
+
+class VideoOutput:
+    """
+    MP4 writer (plus optional streaming GIF) for one recording, optionally cut
+    into rolling segments of `segment_seconds` so open-ended recordings end up
+    as a series of bounded files on disk.
+
+    Files are named <base>.mp4/.gif, or <base>_part001.mp4/.gif, ... when
+    segmenting.
+    """
+
+    def __init__(self, base_name: str, size, fps: float, write_gif: bool = True,
+                 segment_seconds: Optional[float] = None):
+        self.base_name = base_name
+        self.size = tuple(size)
+        self.fps = fps
+        self.write_gif = write_gif
+        self.segment_frames = int(segment_seconds * fps) if segment_seconds else None
+        self.segments: List[Dict] = []
+
+        self._video_writer = None
+        self._gif_writer = None
+        self._last_gif_frame = None
+        self._reseed_at = None  # new segment's start, until its GIF gets a frame
+        self._open_segment()
+
+    def _segment_name(self, index: int) -> str:
+        if self.segment_frames is None:
+            return self.base_name
+        return f"{self.base_name}_part{index + 1:03d}"
+
+    def _open_segment(self):
+        name = self._segment_name(len(self.segments))
+        segment = {"video_file": f"{name}.mp4", "gif_file": f"{name}.gif" if self.write_gif else None}
+        self.segments.append(segment)
+
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self._video_writer = cv2.VideoWriter(segment["video_file"], fourcc, self.fps, self.size)
+        if self.write_gif:
+            self._gif_writer = StreamingGifWriter(segment["gif_file"], self.size, 1.0 / self.fps)
+
+    def _close_segment(self, end_time: Optional[float]):
+        self._video_writer.release()
+        if self._gif_writer is not None:
+            self._reseed(end_time)
+            self._gif_writer.close(end_time)
+            self._gif_writer = None
+
+    def maybe_roll(self, tick: int, timestamp: float):
+        """Start a new segment if frame slot `tick` is past the current one's end"""
+        if self.segment_frames is None:
+            return
+        while tick >= len(self.segments) * self.segment_frames:
+            self._close_segment(timestamp)
+            self._open_segment()
+            # Unchanged frames are not re-sent, so the new GIF starts with the
+            # one still on screen unless a new frame arrives right away
+            self._reseed_at = timestamp
+            print(f"🎥 New segment: {self.segments[-1]['video_file']}")
+
+    def write_video(self, frame_bgr):
+        self._video_writer.write(frame_bgr)
+
+    def append_gif(self, frame: Image.Image, timestamp: float):
+        if self._gif_writer is None:
+            return
+        self._reseed(timestamp)
+        self._gif_writer.append_timed(frame, timestamp)
+        self._last_gif_frame = frame
+
+    def _reseed(self, until: Optional[float]):
+        if self._reseed_at is not None and self._last_gif_frame is not None:
+            if until is None or until > self._reseed_at:
+                self._gif_writer.append_timed(self._last_gif_frame, self._reseed_at)
+        self._reseed_at = None
+
+    def close(self, end_time: Optional[float] = None):
+        self._close_segment(end_time)
@@ -0,0 +1,58 @@
+import sys
+from typing import Dict, List, Optional, Tuple
+
+
+def parse_region(text: str) -> Optional[Tuple[int, int, int, int]]:
+    """Parse a "left,top,width,height" string into a capture region (empty -> None)"""
+    text = (text or "").strip()
+    if not text:
+        return None
+    try:
+        parts = [int(p) for p in text.replace("x", ",").split(",")]
+    except ValueError:
+        parts = []
+    if len(parts) != 4 or parts[2] <= 0 or parts[3] <= 0:
+        raise ValueError(f"Invalid capture region: {text} (expected left,top,width,height)")
+    return tuple(parts)
+
+
+def list_windows(min_size: int = 100) -> List[Dict]:
+    """
+    List visible top-level windows that can be used as a capture region.
+    Only implemented on Windows.
+
+    Returns:
+        List of dicts with 'title' and 'region' (left, top, width, height).
+        Empty on other platforms.
+    """
+    if sys.platform != "win32":
+        return []
+
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    windows = []
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def enum_proc(hwnd, lparam):
+        if not user32.IsWindowVisible(hwnd) or user32.IsIconic(hwnd):
+            return True
+        length = user32.GetWindowTextLengthW(hwnd)
+        if length == 0:
+            return True
+        title = ctypes.create_unicode_buffer(length + 1)
+        user32.GetWindowTextW(hwnd, title, length + 1)
+
+        rect = wintypes.RECT()
+        user32.GetWindowRect(hwnd, ctypes.byref(rect))
+        width, height = rect.right - rect.left, rect.bottom - rect.top
+        if width >= min_size and height >= min_size:
+            windows.append({
+                "title": title.value,
+                "region": (rect.left, rect.top, width, height),
+            })
+        return True
+
+    user32.EnumWindows(enum_proc, 0)
+    return windows
@@ -1,14 +1,36 @@
 import os
+import asyncio
+import contextlib
 import datetime
 import threading
 import time
 from pathlib import Path
 from typing import List, Dict, Optional, Callable
 import json
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
 # Import our existing modules
 from audiovisual.av_trigger import record as record_clip
-from transcribe.transcribe_summary import transcribe_audio, summarize_transcription
+from audiovisual.finalize import ClipFinalizer
+from transcribe.transcribe_summary import (transcribe_chunks, transcribe_chunks_async, join_chunks,
+                                           summarize_transcription, summarize_transcription_async,
+                                           summarize_transcriptions, summarize_transcriptions_async,
+                                           summarize_transcription_stream,
+                                           summarize_transcription_stream_async, clean_summary,
+                                           summary_usage)
+from transcribe.clients import async_clients_scope
+from transcribe.cache import result_cache
+from transcribe.audio_upload import prepare_clip_audio
+
+
+# Clips in each processing stage at once. Each transcription can itself
+# upload several chunks in parallel (WHISPER_WORKERS).
+TRANSCRIBE_CONCURRENCY = int(os.getenv("AUTODOCS_TRANSCRIBE_CONCURRENCY", "2"))
+SUMMARIZE_CONCURRENCY = int(os.getenv("AUTODOCS_SUMMARIZE_CONCURRENCY", "4"))
+# Minimum seconds between partial-summary status updates
+PARTIAL_STATUS_INTERVAL = 0.25
+# Characters of a partial summary shown in the status bar
+PARTIAL_STATUS_CHARS = 80
 
 
 class AutoDocsOrchestrator:
@@ -22,8 +44,12 @@ class AutoDocsOrchestrator:
     4. Organizing clips into a structured document
     """
     
-    def __init__(self, output_dir: str = "autodocs_output"):
-        self.output_dir = Path(output_dir)
+    def __init__(self, output_dir: str = "autodocs_output", background_finalize: bool = True,
+                 batch_summaries: bool = False, stream_summaries: bool = True,
+                 auto_process: bool = False, transcribe_concurrency: int = TRANSCRIBE_CONCURRENCY,
+                 summarize_concurrency: int = SUMMARIZE_CONCURRENCY):
+        # Absolute, so paths stay valid for the worker threads whatever the cwd
+        self.output_dir = Path(output_dir).resolve()
         self.output_dir.mkdir(exist_ok=True)
         
         self.clips: List[Dict] = []
@@ -41,6 +67,32 @@ class AutoDocsOrchestrator:
         
         self.status_callback: Optional[Callable] = None
         
+        # Clips are finalized (MP4 transcode + GIF) in a process pool so the
+        # next recording can start right away
+        self.background_finalize = background_finalize
+        self.finalizer = ClipFinalizer()
+        self._finalizing: Dict[int, Future] = {}
+        self._lock = threading.RLock()
+        
+        # Summarize clips processed together in a few batched requests
+        # instead of one request per clip
+        self.batch_summaries = batch_summaries
+        
+        # Stream single-clip summaries, showing the text in the status as it
+        # is written (at most every PARTIAL_STATUS_INTERVAL seconds)
+        self.stream_summaries = stream_summaries
+        
+        # Queue each clip for transcription and summarization as soon as it
+        # is recorded, so processing overlaps the next recording
+        self.auto_process = auto_process
+        self._processing: Dict[int, Future] = {}
+        
+        # Processing runs as two stages with their own worker pools, so one
+        # clip can be summarized while the next is still being transcribed
+        self.transcribe_concurrency = transcribe_concurrency
+        self.summarize_concurrency = summarize_concurrency
+        self._stage_pools: Optional[tuple] = None
+        
     def set_status_callback(self, callback: Callable[[str], None]):
         """Set a callback function to receive status updates"""
         self.status_callback = callback
@@ -51,13 +103,16 @@ class AutoDocsOrchestrator:
         if self.status_callback:
             self.status_callback(message)
     
-    def record_clip(self, duration: int = 15, title: str = None) -> Dict:
+    def record_clip(self, duration: int = 15, title: str = None,
+                    region: Optional[tuple] = None, output_size: Optional[tuple] = None) -> Dict:
         """
         Record a new clip with audio and video
         
         Args:
             duration: Recording duration in seconds
             title: Optional title for the clip
+            region: Optional (left, top, width, height) screen area to capture
+            output_size: Optional (width, height) box to downscale frames into
             
         Returns:
             Dict containing clip information
@@ -70,58 +125,195 @@ class AutoDocsOrchestrator:
         # Create a timestamp for this clip
         clip_timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Change to the clips directory for recording
-        original_dir = os.getcwd()
         clips_dir = self.session_dir / "clips"
-        
-        # Ensure the clips directory exists
         clips_dir.mkdir(parents=True, exist_ok=True)
-        os.chdir(clips_dir)
         
-        try:
-            # Record the clip using existing av_trigger functionality
-            record_clip(duration=duration, status_callback=self._update_status)
-            
-            # Find the generated files (they'll be the most recent ones)
-            audio_files = list(Path(".").glob("audio_*.wav"))
-            gif_files = list(Path(".").glob("screen_*.gif"))
-            video_files = list(Path(".").glob("screen_*.mp4"))
-            
-            if not audio_files or not gif_files:
-                raise Exception("Recording files not found")
-                
-            # Get the most recent files
-            audio_file = max(audio_files, key=os.path.getctime)
-            gif_file = max(gif_files, key=os.path.getctime)
-            video_file = max(video_files, key=os.path.getctime) if video_files else None
-            
-            # Move files to absolute paths for storage
-            audio_file = Path(audio_file).resolve()
-            gif_file = Path(gif_file).resolve()
-            video_file = Path(video_file).resolve() if video_file else None
-            
-            # Create clip metadata
-            clip_data = {
-                "id": len(self.clips) + 1,
-                "title": title,
-                "timestamp": clip_timestamp,
-                "duration": duration,
-                "audio_file": str(audio_file),
-                "gif_file": str(gif_file),
-                "video_file": str(video_file) if video_file else None,
-                "transcription": None,
-                "summary": None,
-                "status": "recorded"
-            }
-            
+        # Record the clip into the clips directory using existing av_trigger
+        # functionality. With background finalization the GIF is derived from
+        # the MP4 later.
+        files = record_clip(duration=duration, status_callback=self._update_status,
+                            write_gif=not self.background_finalize,
+                            region=region, output_size=output_size, output_dir=str(clips_dir))
+
+        # Move files to absolute paths for storage
+        audio_file = Path(files["audio_file"]).resolve()
+        gif_file = Path(files["gif_file"]).resolve()
+        video_file = Path(files["video_file"]).resolve()
+
+        # Spooled clips get their MP4 built from the spool during finalization
+        spool_file = Path(files["spool_file"]).resolve() if files.get("spool_file") else None
+        if not audio_file.exists() or not (video_file.exists() or (spool_file and spool_file.exists())):
+            raise Exception("Recording files not found")
+
+        # Capture pipeline stats (frame buffer depth, drops) written by the recorder
+        capture_stats = None
+        stats_file = Path(files["capture_stats_file"])
+        if stats_file.exists():
+            with open(stats_file, 'r', encoding='utf-8') as f:
+                capture_stats = json.load(f)
+
+        # Per-frame timestamp / drop index saved next to the clip
+        frame_index_file = Path(files["frame_index_file"]).resolve()
+
+        # Create clip metadata
+        clip_data = {
+            "id": len(self.clips) + 1,
+            "title": title,
+            "timestamp": clip_timestamp,
+            "duration": duration,
+            "audio_file": str(audio_file),
+            "upload_chunks": None,
+            "speech": None,
+            "gif_file": str(gif_file),
+            "video_file": str(video_file),
+            "capture_stats": capture_stats,
+            "frame_index_file": str(frame_index_file) if frame_index_file.exists() else None,
+            "spool_file": str(spool_file) if spool_file else None,
+            "fps": files.get("fps"),
+            "av_sync": files.get("av_sync"),
+            "transcription": None,
+            "summary": None,
+            "status": "finalizing" if self.background_finalize else "recorded"
+        }
+
+        with self._lock:
             self.clips.append(clip_data)
             self._save_session_metadata()
-            
+
+        if self.background_finalize:
+            self._start_finalization(clip_data)
+            self._update_status(f"✅ Clip recorded: {title} (finalizing in background)")
+        else:
             self._update_status(f"✅ Clip recorded: {title}")
-            return clip_data
-            
-        finally:
-            os.chdir(original_dir)
+        if self.auto_process:
+            self._queue_processing(clip_data)
+        return clip_data
+    
+    def _start_finalization(self, clip: Dict):
+        """Hand the clip's MP4 to the finalizer pool and update the clip when it is done"""
+        future = self.finalizer.submit(clip['video_file'], clip['gif_file'],
+                                       spool_file=clip.get('spool_file'), fps=clip.get('fps') or 10)
+        self._finalizing[clip['id']] = future
+        
+        def on_done(done_future):
+            with self._lock:
+                self._finalizing.pop(clip['id'], None)
+                try:
+                    result = done_future.result()
+                    clip['finalize_stats'] = result
+                    clip['spool_file'] = None  # built and removed by the finalizer
+                    self._update_status(f"🎞️ Clip finalized: {clip['title']}")
+                except Exception as e:
+                    # Audio and MP4 are still usable; only the GIF is missing
+                    clip['finalize_error'] = str(e)
+                    self._update_status(f"❌ Error finalizing clip {clip['title']}: {str(e)}")
+                if clip['status'] == 'finalizing':
+                    clip['status'] = 'recorded'
+                self._save_session_metadata()
+        
+        future.add_done_callback(on_done)
+    
+    def wait_for_finalization(self, timeout: Optional[float] = None):
+        """Block until every clip still being finalized has its GIF"""
+        pending = list(self._finalizing.values())
+        if not pending:
+            return
+        self._update_status(f"⏳ Waiting for {len(pending)} clip(s) to finish finalizing...")
+        wait(pending, timeout=timeout)
+    
+    def _queue_processing(self, clip: Dict):
+        """Send the clip through the processing stages in the background"""
+        with self._lock:
+            future = self._submit_pipeline(clip)
+            self._processing[clip['id']] = future
+        
+        def on_done(done_future):
+            with self._lock:
+                if self._processing.get(clip['id']) is done_future:
+                    self._processing.pop(clip['id'])
+        
+        future.add_done_callback(on_done)
+    
+    def _get_stage_pools(self) -> tuple:
+        with self._lock:
+            if self._stage_pools is None:
+                self._stage_pools = (
+                    ThreadPoolExecutor(max_workers=self.transcribe_concurrency,
+                                       thread_name_prefix="autodocs-transcribe"),
+                    ThreadPoolExecutor(max_workers=self.summarize_concurrency,
+                                       thread_name_prefix="autodocs-summarize"),
+                )
+            return self._stage_pools
+    
+    def _submit_pipeline(self, clip: Dict) -> Future:
+        """
+        Queue the clip for transcription, and its summary as soon as the
+        transcript is ready. Failures are recorded on the clip (_fail_clip)
+        and don't affect other clips.
+        
+        Returns:
+            Future resolved with the clip once it is processed, skipped or failed
+        """
+        transcribe_pool, summarize_pool = self._get_stage_pools()
+        done = Future()
+        
+        def transcribe():
+            self._update_status(f"🔄 Processing clip: {clip['title']}")
+            return self._transcribe_clip(clip)
+        
+        def summarize(transcription):
+            self._store_summary(clip, self._summarize_clip(clip, transcription))
+        
+        def finish(error: Optional[Exception] = None):
+            # Always resolve `done`, even if recording the failure itself fails
+            if done.done():
+                return
+            try:
+                if error is not None:
+                    self._fail_clip(clip, error)
+            except Exception as e:
+                done.set_exception(e)
+            else:
+                done.set_result(clip)
+        
+        def after_transcribe(future):
+            try:
+                transcription = future.result()
+                if transcription is None:
+                    finish()
+                else:
+                    summarize_pool.submit(summarize, transcription).add_done_callback(after_summarize)
+            except Exception as e:
+                finish(e)
+        
+        def after_summarize(future):
+            try:
+                future.result()
+            except Exception as e:
+                finish(e)
+            else:
+                finish()
+        
+        transcribe_pool.submit(transcribe).add_done_callback(after_transcribe)
+        return done
+    
+    def wait_for_processing(self, timeout: Optional[float] = None):
+        """Block until every clip queued for auto-processing is done"""
+        pending = list(self._processing.values())
+        if not pending:
+            return
+        self._update_status(f"⏳ Waiting for {len(pending)} clip(s) to finish processing...")
+        wait(pending, timeout=timeout)
+    
+    def shutdown(self):
+        """Finish background finalization and processing, and release the worker pools"""
+        self.wait_for_finalization()
+        self.wait_for_processing()
+        self.finalizer.shutdown()
+        if self._stage_pools is not None:
+            for pool in self._stage_pools:
+                pool.shutdown()
+            self._stage_pools = None
     
     def process_clip(self, clip_id: int) -> Dict:
         """
@@ -136,47 +328,183 @@ class AutoDocsOrchestrator:
         clip = self._get_clip_by_id(clip_id)
         if not clip:
             raise ValueError(f"Clip with ID {clip_id} not found")
-            
+        
+        # Already queued for auto-processing: wait for that instead of racing it
+        queued = self._processing.get(clip_id)
+        if queued is not None:
+            queued.result()
+            if clip['status'] == 'error':
+                raise Exception(clip['error'])
+            return clip
+        return self._process_clip(clip)
+    
+    def _process_clip(self, clip: Dict) -> Dict:
         self._update_status(f"🔄 Processing clip: {clip['title']}")
         
         try:
-            # Transcribe audio
-            self._update_status(f"🎵 Transcribing audio for: {clip['title']}")
-            transcription = transcribe_audio(clip['audio_file'])
-            clip['transcription'] = transcription
+            transcription = self._transcribe_clip(clip)
+            if transcription is None:
+                return clip
             
-            # Save transcription to file
-            transcript_file = self.session_dir / "transcripts" / f"clip_{clip_id}_transcript.txt"
-            with open(transcript_file, 'w', encoding='utf-8') as f:
-                f.write(transcription)
-            clip['transcript_file'] = str(transcript_file)
+            self._store_summary(clip, self._summarize_clip(clip, transcription))
+            return clip
+            
+        except Exception as e:
+            self._fail_clip(clip, e)
+            raise
+    
+    def _summarize_clip(self, clip: Dict, transcription: str) -> str:
+        # Generate summary
+        self._update_status(f"📝 Generating summary for: {clip['title']}")
+        if self.stream_summaries:
+            summary, stats = summarize_transcription_stream(
+                transcription, on_partial=self._partial_summary_status(clip))
+            self._store_summary_stats(clip, stats)
+            return summary
+        return summarize_transcription(transcription)
+    
+    async def process_clip_async(self, clip_id: int) -> Dict:
+        """
+        Async process_clip: the network calls go through the async API, so
+        many clips can be in flight at once (bounded by the request
+        semaphore, see transcribe.clients.MAX_IN_FLIGHT)
+        """
+        clip = self._get_clip_by_id(clip_id)
+        if not clip:
+            raise ValueError(f"Clip with ID {clip_id} not found")
+        async with async_clients_scope():
+            return await self._process_clip_async(clip)
+    
+    async def _process_clip_async(self, clip: Dict, stages: Optional[tuple] = None) -> Dict:
+        """process_clip_async; `stages` optionally holds (transcribe, summarize) semaphores"""
+        transcribe_slot, summarize_slot = stages or (None, None)
+        self._update_status(f"🔄 Processing clip: {clip['title']}")
+        
+        try:
+            async with transcribe_slot or contextlib.nullcontext():
+                transcription = await self._transcribe_clip_async(clip)
+            if transcription is None:
+                return clip
             
-            # Generate summary
             self._update_status(f"📝 Generating summary for: {clip['title']}")
-            summary = summarize_transcription(transcription)
-            clip['summary'] = summary
+            async with summarize_slot or contextlib.nullcontext():
+                if self.stream_summaries:
+                    summary, stats = await summarize_transcription_stream_async(
+                        transcription, on_partial=self._partial_summary_status(clip))
+                    self._store_summary_stats(clip, stats)
+                else:
+                    summary = await summarize_transcription_async(transcription)
+            self._store_summary(clip, summary)
+            return clip
             
-            # Save summary to file
-            summary_file = self.session_dir / "transcripts" / f"clip_{clip_id}_summary.txt"
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                f.write(summary)
+        except Exception as e:
+            self._fail_clip(clip, e)
+            raise
+    
+    def _transcribe_clip(self, clip: Dict) -> Optional[str]:
+        """Transcribe a clip's audio; None if it had no speech and is already done"""
+        if self._skip_silent_clip(clip):
+            return None
+        
+        # Transcribe audio
+        self._update_status(f"🎵 Transcribing audio for: {clip['title']}")
+        # Long clips go up as silence-aligned chunks transcribed in parallel
+        return self._store_transcription(clip, transcribe_chunks(clip['audio_file']))
+    
+    async def _transcribe_clip_async(self, clip: Dict) -> Optional[str]:
+        if await asyncio.to_thread(self._skip_silent_clip, clip):
+            return None
+        
+        self._update_status(f"🎵 Transcribing audio for: {clip['title']}")
+        return self._store_transcription(clip, await transcribe_chunks_async(clip['audio_file']))
+    
+    def _skip_silent_clip(self, clip: Dict) -> bool:
+        """Mark a clip nobody spoke in as processed; True if it was skipped"""
+        # Clips nobody spoke in skip the Whisper and GPT-4o round-trips. Voice
+        # activity and the upload copy come from one read of the WAV, done
+        # here on the processing path rather than while recording
+        if clip.get('speech') is None:
+            speech, upload_chunks = prepare_clip_audio(clip['audio_file'])
+            with self._lock:
+                clip['speech'] = speech
+                clip['upload_chunks'] = upload_chunks
+        if clip['speech']['has_speech']:
+            return False
+        with self._lock:
+            clip['transcription'] = ""
+            clip['summary'] = ""
+            clip['status'] = 'processed'
+            self._save_session_metadata()
+        self._update_status(f"🔇 No speech in clip: {clip['title']} (skipped transcription)")
+        return True
+    
+    def _store_transcription(self, clip: Dict, chunks: List[Dict]) -> str:
+        """Keep the stitched transcript and its chunks on the clip and on disk"""
+        transcription = join_chunks(chunks)
+        
+        # Save transcription to file
+        transcript_file = self.session_dir / "transcripts" / f"clip_{clip['id']}_transcript.txt"
+        with open(transcript_file, 'w', encoding='utf-8') as f:
+            f.write(transcription)
+        
+        # Clips are saved to the session metadata from other threads
+        with self._lock:
+            clip['transcription'] = transcription
+            clip['transcript_chunks'] = [{k: chunk[k] for k in ("start", "end", "text")} for chunk in chunks]
+            clip['transcript_file'] = str(transcript_file)
+        return transcription
+    
+    def _store_summary(self, clip: Dict, summary: str):
+        """Keep the summary on the clip and on disk, and mark the clip processed"""
+        # Save summary to file
+        summary_file = self.session_dir / "transcripts" / f"clip_{clip['id']}_summary.txt"
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            f.write(summary)
+        
+        with self._lock:
+            clip['summary'] = summary
             clip['summary_file'] = str(summary_file)
-            
             clip['status'] = 'processed'
             self._save_session_metadata()
-            
-            self._update_status(f"✅ Clip processed: {clip['title']}")
-            return clip
-            
-        except Exception as e:
-            self._update_status(f"❌ Error processing clip {clip['title']}: {str(e)}")
+        
+        self._update_status(f"✅ Clip processed: {clip['title']}")
+    
+    def _partial_summary_status(self, clip: Dict) -> Callable[[str], None]:
+        """on_partial callback showing the tail of a clip's summary as it streams in"""
+        last_update = [0.0]
+        
+        def on_partial(text: str):
+            now = time.monotonic()
+            if not self.status_callback or now - last_update[0] < PARTIAL_STATUS_INTERVAL:
+                return
+            last_update[0] = now
+            tail = " ".join(clean_summary(text).split())
+            if len(tail) > PARTIAL_STATUS_CHARS:
+                tail = "…" + tail[-PARTIAL_STATUS_CHARS:]
+            # Straight to the callback: printing every partial would flood the console
+            self.status_callback(f"📝 {clip['title']}: {tail}")
+        
+        return on_partial
+    
+    def _store_summary_stats(self, clip: Dict, stats: Dict):
+        with self._lock:
+            clip['summary_stats'] = stats
+        if not stats.get('cached'):
+            print(f"[AutoDocs] ⏱️ Summary for {clip['title']}: first token {stats['ttft_ms']} ms, "
+                  f"total {stats['latency_ms']} ms, {stats['input_tokens']} tokens in, "
+                  f"{stats['output_tokens']} out")
+    
+    def _fail_clip(self, clip: Dict, e: Exception):
+        self._update_status(f"❌ Error processing clip {clip['title']}: {str(e)}")
+        with self._lock:
             clip['status'] = 'error'
             clip['error'] = str(e)
             self._save_session_metadata()
-            raise
     
     def process_all_clips(self):
         """Process all recorded clips that haven't been processed yet"""
+        self.wait_for_finalization()
+        self.wait_for_processing()
         unprocessed_clips = [clip for clip in self.clips if clip['status'] == 'recorded']
         
         if not unprocessed_clips:
@@ -185,12 +513,111 @@ class AutoDocsOrchestrator:
             
         self._update_status(f"📋 Processing {len(unprocessed_clips)} clips...")
         
-        for clip in unprocessed_clips:
+        if self.batch_summaries:
+            self._process_clips_batched(unprocessed_clips)
+            self._report_processing_stats()
+            return
+        
+        # Pipelined: summaries start as soon as each transcript is ready
+        wait([self._submit_pipeline(clip) for clip in unprocessed_clips])
+        self._report_processing_stats()
+    
+    def _process_clips_batched(self, clips: List[Dict]):
+        """Transcribe the clips on the transcribe pool, then summarize them all in batched requests"""
+        transcribe_pool, _ = self._get_stage_pools()
+        futures = {transcribe_pool.submit(self._transcribe_clip, clip): clip for clip in clips}
+        transcripts = {}
+        for future, clip in futures.items():
             try:
-                self.process_clip(clip['id'])
+                transcription = future.result()
             except Exception as e:
-                self._update_status(f"❌ Failed to process clip {clip['id']}: {str(e)}")
+                self._fail_clip(clip, e)
                 continue
+            if transcription is not None:
+                transcripts[clip['id']] = transcription
+        
+        if not transcripts:
+            return
+        self._update_status(f"📝 Generating summaries for {len(transcripts)} clips (batched)...")
+        try:
+            summaries, errors = summarize_transcriptions(transcripts)
+        except Exception as e:
+            for clip_id in transcripts:
+                self._fail_clip(self._get_clip_by_id(clip_id), e)
+            return
+        # Only the clips whose batch or own request failed are marked failed
+        for clip_id, summary in summaries.items():
+            self._store_summary(self._get_clip_by_id(clip_id), summary)
+        for clip_id, e in errors.items():
+            self._fail_clip(self._get_clip_by_id(clip_id), e)
+    
+    async def process_all_clips_async(self):
+        """
+        Process all recorded clips concurrently through the async API.
+        Failures are reported per clip and don't stop the others.
+        """
+        await asyncio.to_thread(self.wait_for_finalization)
+        await asyncio.to_thread(self.wait_for_processing)
+        unprocessed_clips = [clip for clip in self.clips if clip['status'] == 'recorded']
+        
+        if not unprocessed_clips:
+            self._update_status("No clips to process")
+            return
+            
+        self._update_status(f"📋 Processing {len(unprocessed_clips)} clips concurrently...")
+        
+        async with async_clients_scope():
+            if self.batch_summaries:
+                await self._process_clips_batched_async(unprocessed_clips)
+                self._report_processing_stats()
+                return
+            stages = (asyncio.Semaphore(self.transcribe_concurrency),
+                      asyncio.Semaphore(self.summarize_concurrency))
+            results = await asyncio.gather(*(self._process_clip_async(clip, stages) for clip in unprocessed_clips),
+                                           return_exceptions=True)
+        for clip, result in zip(unprocessed_clips, results):
+            if isinstance(result, Exception):
+                self._update_status(f"❌ Failed to process clip {clip['id']}: {str(result)}")
+        self._report_processing_stats()
+    
+    async def _process_clips_batched_async(self, clips: List[Dict]):
+        """Async _process_clips_batched: clips are transcribed concurrently"""
+        results = await asyncio.gather(*(self._transcribe_clip_async(clip) for clip in clips),
+                                       return_exceptions=True)
+        transcripts = {}
+        for clip, result in zip(clips, results):
+            if isinstance(result, Exception):
+                self._fail_clip(clip, result)
+            elif result is not None:
+                transcripts[clip['id']] = result
+        
+        if not transcripts:
+            return
+        self._update_status(f"📝 Generating summaries for {len(transcripts)} clips (batched)...")
+        try:
+            summaries, errors = await summarize_transcriptions_async(transcripts)
+        except Exception as e:
+            for clip_id in transcripts:
+                self._fail_clip(self._get_clip_by_id(clip_id), e)
+            return
+        # Only the clips whose batch or own request failed are marked failed
+        for clip_id, summary in summaries.items():
+            self._store_summary(self._get_clip_by_id(clip_id), summary)
+        for clip_id, e in errors.items():
+            self._fail_clip(self._get_clip_by_id(clip_id), e)
+    
+    def _report_processing_stats(self):
+        """Show how many transcripts/summaries came from the result cache, and summary token use"""
+        cache = result_cache()
+        if cache is not None:
+            stats = cache.stats()
+            self._update_status(f"💾 Result cache: {stats['hits']} hits, {stats['misses']} misses, "
+                                f"{stats['bytes'] / 1024:.1f} KB")
+        usage = summary_usage()
+        if usage['requests']:
+            self._update_status(f"🔢 Summary tokens: {usage['input_tokens']} in, {usage['output_tokens']} out "
+                                f"over {usage['requests']} requests (transcripts compacted from "
+                                f"{usage['transcript_tokens']} to {usage['compacted_tokens']})")
     
     def generate_word_document(self) -> str:
         """
@@ -205,6 +632,7 @@ class AutoDocsOrchestrator:
         except ImportError:
             raise ImportError("python-docx is required. Install it with: pip install python-docx")
         
+        self.wait_for_finalization()
         self._update_status("📄 Generating Word document...")
         
         doc = Document()
@@ -299,6 +727,7 @@ class AutoDocsOrchestrator:
         Returns:
             Path to the generated Markdown document
         """
+        self.wait_for_finalization()
         self._update_status("📄 Generating Markdown document...")
         
         doc_path = self.session_dir / f"AutoDocs_Tutorial_{self.session_id}.md"
@@ -375,6 +804,7 @@ class AutoDocsOrchestrator:
         Returns:
             Path to the generated HTML document
         """
+        self.wait_for_finalization()
         self._update_status("📄 Generating HTML document...")
         
         doc_path = self.session_dir / f"AutoDocs_Tutorial_{self.session_id}.html"
@@ -573,7 +1003,9 @@ class AutoDocsOrchestrator:
         
         metadata_file = self.session_dir / "session_metadata.json"
         try:
-            with open(metadata_file, 'w', encoding='utf-8') as f:
+            # Finalization and the processing stages update clips from other
+            # threads, always under the lock
+            with self._lock, open(metadata_file, 'w', encoding='utf-8') as f:
                 json.dump({
                     'session_id': self.session_id,
                     'created': datetime.datetime.now().isoformat(),
@@ -586,7 +1018,7 @@ class AutoDocsOrchestrator:
     
     def load_session(self, session_dir: str):
         """Load an existing session from directory"""
-        session_path = Path(session_dir)
+        session_path = Path(session_dir).resolve()
         metadata_file = session_path / "session_metadata.json"
         
         if not metadata_file.exists():
@@ -599,6 +1031,16 @@ class AutoDocsOrchestrator:
         self.clips = data['clips']
         self.session_dir = session_path
         
+        # Resume finalization interrupted by a previous run
+        for clip in self.clips:
+            if clip['status'] == 'finalizing':
+                if clip.get('spool_file') and os.path.exists(clip['spool_file']):
+                    self._start_finalization(clip)
+                elif clip.get('video_file') and os.path.exists(clip['video_file']):
+                    self._start_finalization(clip)
+                else:
+                    clip['status'] = 'recorded'
+        
         self._update_status(f"📂 Loaded session: {self.session_id}")
     
     def get_session_summary(self) -> Dict:
@@ -5,6 +5,17 @@ from PyQt5 import QtWidgets, QtCore, QtGui
 from autodocs_orchestrator import AutoDocsOrchestrator
 import numpy as np
 from pynput import mouse
+from audiovisual.windows import list_windows, parse_region
+
+
+# Output size presets for the record dialog (frames are downscaled to fit)
+OUTPUT_SIZE_CHOICES = [
+    ("Original resolution", None),
+    ("1920 × 1080", (1920, 1080)),
+    ("1280 × 720", (1280, 720)),
+    ("960 × 540", (960, 540)),
+    ("640 × 360", (640, 360)),
+]
 
 
 class ClipRecordDialog(QtWidgets.QDialog):
@@ -12,13 +23,15 @@ class ClipRecordDialog(QtWidgets.QDialog):
     def __init__(self, parent=None, clip_count=0):
         super().__init__(parent)
         self.setWindowTitle("Record New Clip")
-        self.setMinimumSize(700, 400)  # Increased from 200 to 400 
-        self.setFixedSize(700, 400)    # Match minimum size
+        self.setMinimumSize(700, 480)  # Room for capture area / output size
+        self.setFixedSize(700, 480)    # Match minimum size
         self.setWindowFlags(self.windowFlags() | QtCore.Qt.WindowStaysOnTopHint)
         
         # Results
         self.title = None
         self.duration = 15
+        self.region = None  # None = full screen
+        self.output_size = None  # None = native resolution
         
         self.setup_ui(clip_count)
     
@@ -83,13 +96,44 @@ class ClipRecordDialog(QtWidgets.QDialog):
         custom_layout = QtWidgets.QHBoxLayout()
         custom_layout.addWidget(QtWidgets.QLabel("Custom:"))
         self.custom_duration = QtWidgets.QSpinBox()
-        self.custom_duration.setRange(10, 60)
+        self.custom_duration.setRange(10, 600)  # clips over 60s are spooled to disk
         self.custom_duration.setValue(15)
         self.custom_duration.valueChanged.connect(self.set_custom_duration)
         custom_layout.addWidget(self.custom_duration)
         custom_layout.addStretch()
         layout.addLayout(custom_layout)
         
+        # Capture area: full screen, a single window (Windows only) or a
+        # custom rectangle
+        layout.addWidget(QtWidgets.QLabel("Capture area:"))
+        self.region_combo = QtWidgets.QComboBox()
+        self.region_combo.setStyleSheet("padding: 6px; border: 1px solid #ccc; border-radius: 4px;")
+        self.region_combo.addItem("🖥️ Full screen", None)
+        for window in list_windows():
+            self.region_combo.addItem(f"🪟 {window['title'][:60]}", window['region'])
+        self.region_combo.addItem("✏️ Custom region...", "custom")
+        layout.addWidget(self.region_combo)
+        
+        self.region_input = QtWidgets.QLineEdit()
+        self.region_input.setPlaceholderText("left,top,width,height (e.g. 0,0,1280,720)")
+        self.region_input.setVisible(False)
+        self.region_combo.currentIndexChanged.connect(
+            lambda: self.region_input.setVisible(self.region_combo.currentData() == "custom"))
+        layout.addWidget(self.region_input)
+        
+        if sys.platform != "win32":
+            window_note = QtWidgets.QLabel("Picking a single window is only available on Windows.")
+            window_note.setStyleSheet("color: #6c757d; font-size: 11px;")
+            layout.addWidget(window_note)
+        
+        # Output resolution, applied at capture time
+        layout.addWidget(QtWidgets.QLabel("Output size:"))
+        self.size_combo = QtWidgets.QComboBox()
+        self.size_combo.setStyleSheet("padding: 6px; border: 1px solid #ccc; border-radius: 4px;")
+        for label, size in OUTPUT_SIZE_CHOICES:
+            self.size_combo.addItem(label, size)
+        layout.addWidget(self.size_combo)
+        
         # Instructions
         instructions = QtWidgets.QLabel("💡 Position your screen and get ready before clicking Record!")
         instructions.setStyleSheet("color: #6c757d; font-style: italic; margin: 10px 0;")
@@ -126,6 +170,14 @@ class ClipRecordDialog(QtWidgets.QDialog):
     
     def accept(self):
         self.title = self.title_input.text().strip() or None
+        self.region = self.region_combo.currentData()
+        if self.region == "custom":
+            try:
+                self.region = parse_region(self.region_input.text())
+            except ValueError as e:
+                QtWidgets.QMessageBox.warning(self, "Warning", str(e))
+                return
+        self.output_size = self.size_combo.currentData()
         super().accept()
 
 
@@ -192,7 +244,7 @@ class SessionManagementDialog(QtWidgets.QDialog):
         
         self.clips_list.clear()
         for clip in self.orchestrator.clips:
-            status_emoji = {"recorded": "🔴", "processed": "✅", "error": "❌"}.get(clip['status'], "❓")
+            status_emoji = {"finalizing": "⏳", "recorded": "🔴", "processed": "✅", "error": "❌"}.get(clip['status'], "❓")
             item_text = f"{status_emoji} {clip['id']}. {clip['title']} ({clip['duration']}s) - {clip['status']}"
             item = QtWidgets.QListWidgetItem(item_text)
             item.setData(QtCore.Qt.UserRole, clip['id'])
@@ -243,7 +295,8 @@ class SessionManagementDialog(QtWidgets.QDialog):
 class AutoDocsBar(QtWidgets.QWidget):
     def __init__(self):
         super().__init__()
-        self.orchestrator = AutoDocsOrchestrator()
+        # Clips are transcribed and summarized in the background while the next one is recorded
+        self.orchestrator = AutoDocsOrchestrator(auto_process=True)
         self.orchestrator.set_status_callback(self.update_status_clean)
         self.drag_position = None
         self.theme_timer = QtCore.QTimer()
@@ -415,7 +468,7 @@ class AutoDocsBar(QtWidgets.QWidget):
         """Show the record clip dialog"""
         dialog = ClipRecordDialog(self, len(self.orchestrator.clips))
         if dialog.exec_() == QtWidgets.QDialog.Accepted:
-            self.start_recording(dialog.title, dialog.duration)
+            self.start_recording(dialog.title, dialog.duration, dialog.region, dialog.output_size)
 
     def show_manage_dialog(self):
         """Show the session management dialog"""
@@ -507,7 +560,7 @@ class AutoDocsBar(QtWidgets.QWidget):
         self.update()
 
 
-    def start_recording(self, title=None, duration=15):
+    def start_recording(self, title=None, duration=15, region=None, output_size=None):
 
         self.mouse_listener = mouse.Listener(on_click=self.on_click)
         self.mouse_listener.start()
@@ -522,9 +575,11 @@ class AutoDocsBar(QtWidgets.QWidget):
 
         def run_recording():
             try:
-                # Use orchestrator to record clip (without auto-processing like interactive mode)
+                # Use orchestrator to record clip (processed in the background once saved)
                 clip = self.orchestrator.record_clip(duration=duration,
-                                                    title=title)
+                                                    title=title,
+                                                    region=region,
+                                                    output_size=output_size)
 
                                 # Stop mouse listener when recording ends
                 if self.mouse_listener:
@@ -540,12 +595,12 @@ class AutoDocsBar(QtWidgets.QWidget):
 
                 # (assume the orchestrator has finished persisting by now)
 
-                # Update status - just recorded, not processed yet (like interactive mode)
-                self.update_status_clean(f"✅ Clip '{clip['title']}' recorded! Use Manage to process or Generate to auto-process all.")
+                # Update status - recorded, now being transcribed and summarized in the background
+                self.update_status_clean(f"✅ Clip '{clip['title']}' recorded! Processing in the background.")
                 # Auto-restore after showing success message briefly
                 QtCore.QTimer.singleShot(500,
                     lambda: self.update_status_clean(
-                        f"✅ Clip '{clip['title']}' recorded! Use Manage to process or Generate to auto-process all."
+                        f"✅ Clip '{clip['title']}' recorded! Processing in the background."
                     ))
                 def delayed_restore():
                     time.sleep(3)  # Show success message for 3 seconds
@@ -633,6 +688,8 @@ class AutoDocsBar(QtWidgets.QWidget):
     
     def _process_unprocessed_clips(self):
         """Internal method to process any unprocessed clips (like interactive mode)"""
+        self.orchestrator.wait_for_finalization()
+        self.orchestrator.wait_for_processing()
         unprocessed_clips = [c for c in self.orchestrator.clips if c['status'] == 'recorded']
         
         if not unprocessed_clips:
@@ -732,7 +789,7 @@ Clips List:
         
         if self.orchestrator.clips:
             for clip in self.orchestrator.clips:
-                status_emoji = {"recorded": "🔴 Recorded", "processed": "✅ Processed", "error": "❌ Error"}.get(clip['status'], "❓ Unknown")
+                status_emoji = {"finalizing": "⏳ Finalizing", "recorded": "🔴 Recorded", "processed": "✅ Processed", "error": "❌ Error"}.get(clip['status'], "❓ Unknown")
                 session_info += f"\n{clip['id']}. {clip['title']} ({clip['duration']}s) - {status_emoji}"
                 if clip['status'] == 'error' and clip.get('error'):
                     session_info += f"\n   Error: {clip['error']}"
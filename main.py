@@ -70,11 +70,11 @@ def record_clip_interactive(orchestrator: AutoDocsOrchestrator):
     if not title:
         title = None
     
-    duration_input = input("Enter duration in seconds (10-30, default 15): ").strip()
+    duration_input = input("Enter duration in seconds (10-600, default 15): ").strip()
     try:
         duration = int(duration_input) if duration_input else 15
-        if duration < 10 or duration > 30:
-            print("⚠️  Duration should be between 10-30 seconds. Using 15 seconds.")
+        if duration < 10 or duration > 600:
+            print("⚠️  Duration should be between 10-600 seconds. Using 15 seconds.")
             duration = 15
     except ValueError:
         print("⚠️  Invalid duration. Using 15 seconds.")
@@ -184,7 +184,7 @@ def show_session_summary(orchestrator: AutoDocsOrchestrator):
     if orchestrator.clips:
         print(f"\nClips:")
         for clip in orchestrator.clips:
-            status_emoji = {"recorded": "🔴", "processed": "✅", "error": "❌"}.get(clip['status'], "❓")
+            status_emoji = {"finalizing": "⏳", "recorded": "🔴", "processed": "✅", "error": "❌"}.get(clip['status'], "❓")
             print(f"   {status_emoji} {clip['id']}. {clip['title']} ({clip['duration']}s) - {clip['status']}")
 
 
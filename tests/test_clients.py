@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+clients = pytest.importorskip("transcribe.clients")
+
+
+def test_last_async_scope_closes_the_clients(monkeypatch):
+    monkeypatch.setenv("WHISPER_ENDPOINT", "http://127.0.0.1:1/whisper")
+    monkeypatch.setenv("WHISPER_KEY", "key")
+
+    async def use_client(release):
+        async with clients.async_clients_scope():
+            client, _ = clients.async_whisper_client()
+            await release.wait()
+            return client
+
+    async def main():
+        first, second = asyncio.Event(), asyncio.Event()
+        tasks = [asyncio.create_task(use_client(first)), asyncio.create_task(use_client(second))]
+        await asyncio.sleep(0)
+        first.set()
+        client = await tasks[0]
+        # Still in use by the second scope
+        assert not client.is_closed
+        second.set()
+        assert await tasks[1] is client
+        return client
+
+    assert asyncio.run(main()).is_closed
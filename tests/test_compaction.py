@@ -0,0 +1,26 @@
+import pytest
+
+compaction = pytest.importorskip("transcribe.compaction")
+
+
+@pytest.mark.parametrize("text", [
+    "Press Tab. Press Tab.",
+    "Press Ctrl Z Z to undo twice.",
+    "Press Tab Tab and then Enter.",
+    "Click OK. Next, open the menu. Click OK.",
+    "Set it to 10 10 times.",
+    "Press 1 2 1 2 on the keypad.",
+    "Er 404 is returned.",
+])
+def test_repeated_steps_are_kept(text):
+    assert compaction.clean_transcript(text) == text
+
+
+@pytest.mark.parametrize("text, cleaned", [
+    ("Um, so uh we click the, click the button.", "so we click the button."),
+    ("Open the the settings.", "Open the settings."),
+    ("Save it. Thank you. Thank you. Thank you.", "Save it. Thank you."),
+    ("It's, you know, erm really simple.", "It's, really simple."),
+])
+def test_disfluencies_are_removed(text, cleaned):
+    assert compaction.clean_transcript(text) == cleaned
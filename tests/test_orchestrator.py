@@ -0,0 +1,58 @@
+import os
+import threading
+
+import pytest
+
+orchestrator = pytest.importorskip("autodocs_orchestrator")
+
+
+def fake_recorder(started):
+    """Stand-in for av_trigger.record writing empty clip files into output_dir"""
+    count = [0]
+
+    def record(duration=None, status_callback=None, write_gif=True, region=None,
+               output_size=None, output_dir=None):
+        count[0] += 1
+        started.set()
+        base = os.path.join(output_dir or "", f"screen_{count[0]}")
+        audio_file = os.path.join(output_dir or "", f"audio_{count[0]}.wav")
+        for path in (f"{base}.mp4", audio_file):
+            open(path, "wb").close()
+        return {"video_file": f"{base}.mp4", "gif_file": f"{base}.gif", "audio_file": audio_file,
+                "capture_stats_file": f"{base}_capture.json", "frame_index_file": f"{base}_frames.npz"}
+
+    return record
+
+
+def test_auto_process_while_recording_with_relative_output_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    recording = threading.Event()
+    transcribing = threading.Event()
+
+    def transcribe_chunks(audio_file):
+        # Finish clip 1 only while clip 2 is being recorded
+        transcribing.set()
+        assert recording.wait(5)
+        return [{"start": 0.0, "end": 1.0, "text": "Open the settings."}]
+
+    monkeypatch.setattr(orchestrator, "record_clip", fake_recorder(recording))
+    monkeypatch.setattr(orchestrator, "transcribe_chunks", transcribe_chunks)
+    monkeypatch.setattr(orchestrator, "prepare_clip_audio", lambda path: ({"has_speech": True}, None))
+
+    docs = orchestrator.AutoDocsOrchestrator("out", background_finalize=False, auto_process=True)
+    monkeypatch.setattr(docs, "_summarize_clip", lambda clip, transcription: "Opens the settings.")
+    try:
+        first = docs.record_clip(duration=1)
+        recording.clear()
+        assert transcribing.wait(5)
+        docs.record_clip(duration=1)
+        docs.wait_for_processing(timeout=10)
+    finally:
+        docs.shutdown()
+
+    assert first["status"] == "processed", first.get("error")
+    assert os.path.exists(first["transcript_file"])
+    assert os.path.exists(first["summary_file"])
+    assert docs.session_dir.is_absolute()
+    assert (docs.session_dir / "session_metadata.json").exists()
+    assert not (docs.session_dir / "clips" / "out").exists()
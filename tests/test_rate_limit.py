@@ -0,0 +1,25 @@
+import pytest
+
+rate_limit = pytest.importorskip("transcribe.rate_limit")
+
+
+class ThrottledError(Exception):
+    def __init__(self, headers):
+        super().__init__("429 Too Many Requests")
+        self.status_code = 429
+        self.response = type("Response", (), {"status_code": 429, "headers": headers})()
+
+
+def test_retry_after_seconds():
+    assert rate_limit.retry_after_seconds({"retry-after-ms": "1500"}) == 1.5
+    assert rate_limit.retry_after_seconds({"retry-after": "2"}) == 2.0
+    assert rate_limit.retry_after_seconds({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+
+
+@pytest.mark.parametrize("value", ["soon", "Wed, 99 Foo 2015 07:28:00 GMT", "  "])
+def test_retry_after_seconds_ignores_garbage(value):
+    assert rate_limit.retry_after_seconds({"retry-after": value}) is None
+
+
+def test_garbage_retry_after_keeps_the_error_retryable():
+    assert rate_limit.classify_error(ThrottledError({"retry-after": "soon"})) == (True, 429, None)
@@ -0,0 +1,63 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+summary = pytest.importorskip("transcribe.transcribe_summary")
+
+
+def response(content):
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def batch_answer(messages):
+    items = json.loads(messages[1]["content"])["transcripts"]
+    if any(item["transcript"].startswith("Fail") for item in items):
+        raise RuntimeError("batch failed")
+    # Clip 2 is left out of the answer and summarized on its own
+    return response(json.dumps({"summaries": [{"id": item["id"], "summary": f"Summary {item['id']}"}
+                                              for item in items if item["id"] != "2"]}))
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Two clips per batch, no result cache, and a fallback that fails for clip 2"""
+    monkeypatch.setattr(summary, "BATCH_MAX_CLIPS", 2)
+    monkeypatch.setattr(summary, "result_cache", lambda: None)
+
+    def fallback(transcript):
+        raise RuntimeError("fallback failed")
+
+    async def fallback_async(transcript):
+        fallback(transcript)
+
+    monkeypatch.setattr(summary, "summarize_transcription", fallback)
+    monkeypatch.setattr(summary, "summarize_transcription_async", fallback_async)
+    return {1: "Open the menu.", 2: "Click Save.", 3: "Fail here.", 4: "Close it."}
+
+
+def test_batch_failures_only_fail_their_clips(batches, monkeypatch):
+    completions = SimpleNamespace(create=lambda model, messages, **kw: batch_answer(messages))
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(summary, "openai_client", lambda: (client, {"deployment": "d"}))
+
+    summaries, errors = summary.summarize_transcriptions(batches)
+
+    assert summaries == {1: "Summary 1"}
+    assert set(errors) == {2, 3, 4}
+    assert "fallback failed" in str(errors[2])
+
+
+def test_async_batch_failures_only_fail_their_clips(batches, monkeypatch):
+    async def create(model, messages, **kw):
+        return batch_answer(messages)
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(summary, "async_openai_client", lambda: (client, {"deployment": "d"}))
+
+    summaries, errors = asyncio.run(summary.summarize_transcriptions_async(batches))
+
+    assert summaries == {1: "Summary 1"}
+    assert set(errors) == {2, 3, 4}
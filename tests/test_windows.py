@@ -0,0 +1,15 @@
+import pytest
+
+from audiovisual.windows import parse_region
+
+
+def test_parse_region():
+    assert parse_region("") is None
+    assert parse_region(" 0,0,1280,720 ") == (0, 0, 1280, 720)
+    assert parse_region("10,20,300x200") == (10, 20, 300, 200)
+
+
+@pytest.mark.parametrize("text", ["a,b,c,d", "1,2,3", "1,2,0,4"])
+def test_parse_region_rejects_invalid(text):
+    with pytest.raises(ValueError, match="expected left,top,width,height"):
+        parse_region(text)
@@ -0,0 +1,185 @@
+import json
+import os
+import wave
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from transcribe.vad import compact_speech, split_at_silence
+
+try:
+    import soundfile as sf
+except ImportError:  # optional: without it uploads fall back to 16 kHz WAV
+    sf = None
+
+
+# Whisper works on 16 kHz mono internally, so anything above that is wasted upload
+UPLOAD_SAMPLE_RATE = 16000
+# "flac" (lossless), "opus" (Ogg/Opus, smallest) or "wav"
+UPLOAD_FORMAT = os.getenv("WHISPER_UPLOAD_FORMAT", "flac")
+# Cut leading/trailing silence and long pauses out of the upload
+TRIM_SILENCE = os.getenv("WHISPER_TRIM_SILENCE", "1") != "0"
+# Longer uploads are split at silences into chunks of at most this length
+CHUNK_SECONDS = float(os.getenv("WHISPER_CHUNK_SECONDS", "120"))
+
+_CONTAINERS = {
+    "flac": (".flac", "FLAC", "PCM_16"),
+    "opus": (".ogg", "OGG", "OPUS"),
+}
+
+
+def read_wav(path: str) -> Tuple[np.ndarray, int]:
+    """Read a 16-bit PCM WAV as an int16 (frames, channels) array and its sample rate"""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM, got {wav.getsampwidth() * 8}-bit")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    return samples.reshape(-1, channels), rate
+
+
+def write_wav(path: str, samples: np.ndarray, sample_rate: int):
+    samples = samples.reshape(len(samples), -1)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(samples.shape[1])
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(np.ascontiguousarray(samples, dtype=np.int16).tobytes())
+
+
+def _lowpass_taps(cutoff: float, taps: int = 63) -> np.ndarray:
+    """Windowed-sinc FIR low-pass; cutoff as a fraction of the sample rate"""
+    n = np.arange(taps) - (taps - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return h / h.sum()
+
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """
+    Downmix to mono and resample int16 audio to dst_rate.
+
+    The signal is band-limited with a FIR low-pass below the new Nyquist
+    frequency, then decimated (integer ratios such as 48 kHz -> 16 kHz) or
+    linearly interpolated.
+
+    Returns:
+        int16 array of shape (frames,)
+    """
+    mono = samples.reshape(len(samples), -1).astype(np.float32).mean(axis=1)
+    if src_rate == dst_rate or len(mono) == 0:
+        return mono.astype(np.int16)
+
+    if dst_rate < src_rate:
+        mono = np.convolve(mono, _lowpass_taps(0.5 * dst_rate / src_rate * 0.9), mode="same")
+
+    if src_rate % dst_rate == 0:
+        out = mono[::src_rate // dst_rate]
+    else:
+        count = int(len(mono) * dst_rate / src_rate)
+        positions = np.arange(count) * (src_rate / dst_rate)
+        out = np.interp(positions, np.arange(len(mono)), mono)
+    return np.clip(np.round(out), -32768, 32767).astype(np.int16)
+
+
+def _encode(path_stem: str, audio: np.ndarray, sample_rate: int, upload_format: str) -> str:
+    """Write audio as <path_stem>.flac/.ogg, or .wav without soundfile; returns the path"""
+    ext, container, subtype = _CONTAINERS.get(upload_format, (".wav", None, None))
+    if sf is not None and container is not None:
+        try:
+            path = f"{path_stem}{ext}"
+            sf.write(path, audio, sample_rate, format=container, subtype=subtype)
+            return path
+        except Exception as e:  # e.g. libsndfile built without Opus
+            print(f"Could not encode {upload_format}, uploading WAV instead: {e}")
+
+    path = f"{path_stem}.wav"
+    write_wav(path, audio, sample_rate)
+    return path
+
+
+def prepare_upload(wav_path: str, sample_rate: int = UPLOAD_SAMPLE_RATE,
+                   upload_format: str = UPLOAD_FORMAT, trim_silence: bool = TRIM_SILENCE,
+                   chunk_seconds: float = CHUNK_SECONDS) -> List[Dict]:
+    """
+    Build (once) the compact files actually sent to Whisper: mono, resampled
+    to `sample_rate`, with silence trimmed and long pauses collapsed, in FLAC
+    or Ogg/Opus when soundfile is available and otherwise a 16-bit WAV. Audio
+    longer than `chunk_seconds` is split at silences so the chunks can be
+    transcribed in parallel. The original recording is left untouched.
+
+    Returns:
+        Chunks in order, each {"file", "start", "end"} with its offsets in
+        seconds into the (trimmed) upload audio. A manifest is kept next to
+        the WAV (<name>_upload.json) so later calls reuse the files.
+    """
+    return _prepare(wav_path, sample_rate, upload_format, trim_silence, chunk_seconds,
+                    speech_only=False)["chunks"]
+
+
+def prepare_clip_audio(wav_path: str) -> Tuple[Dict, Optional[List[Dict]]]:
+    """
+    Voice-activity summary of a recording (see transcribe.vad.compact_speech:
+    has_speech, duration, speech_seconds and kept_seconds) and, if anyone
+    spoke, its upload chunks as prepare_upload builds them, from a single
+    read and resample of the WAV.
+
+    Returns:
+        (speech, chunks), with chunks None for a clip without speech
+    """
+    manifest = _prepare(wav_path, UPLOAD_SAMPLE_RATE, UPLOAD_FORMAT, TRIM_SILENCE, CHUNK_SECONDS,
+                        speech_only=True)
+    return manifest["speech"], manifest["chunks"]
+
+
+def _load_manifest(manifest_path: str, wav_path: str) -> Optional[Dict]:
+    """A manifest still current for the WAV, as {"speech", "chunks"}"""
+    if not os.path.exists(manifest_path) or os.path.getmtime(manifest_path) < os.path.getmtime(wav_path):
+        return None
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):  # older manifests hold just the chunks
+        manifest = {"speech": None, "chunks": manifest}
+    chunks = manifest.get("chunks")
+    if chunks is not None and not all(os.path.exists(chunk["file"]) for chunk in chunks):
+        return None
+    return manifest
+
+
+def _prepare(wav_path: str, sample_rate: int, upload_format: str, trim_silence: bool,
+             chunk_seconds: float, speech_only: bool) -> Dict:
+    """
+    Shared body of prepare_upload and prepare_clip_audio. With speech_only,
+    a clip without speech gets no upload files (chunks None).
+    """
+    stem = os.path.splitext(wav_path)[0]
+    manifest_path = f"{stem}_upload.json"
+    manifest = _load_manifest(manifest_path, wav_path)
+    if manifest is not None:
+        if speech_only and manifest["speech"] is not None:
+            return manifest
+        if not speech_only and manifest["chunks"] is not None:
+            return manifest
+
+    samples, rate = read_wav(wav_path)
+    audio = resample(samples, rate, sample_rate)
+    trimmed, speech = compact_speech(audio, sample_rate)
+    if trim_silence:
+        audio = trimmed
+
+    chunks = None
+    if speech["has_speech"] or not speech_only:
+        ranges = split_at_silence(audio, sample_rate, chunk_seconds)
+        chunks = []
+        for i, (start, end) in enumerate(ranges):
+            path_stem = f"{stem}_upload" if len(ranges) == 1 else f"{stem}_upload_{i + 1:03d}"
+            chunks.append({
+                "file": _encode(path_stem, audio[start:end], sample_rate, upload_format),
+                "start": round(start / sample_rate, 3),
+                "end": round(end / sample_rate, 3),
+            })
+
+    manifest = {"speech": speech, "chunks": chunks}
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+# Persistent transcript/summary cache; AUTODOCS_CACHE=0 turns it off
+CACHE_ENABLED = os.getenv("AUTODOCS_CACHE", "1") != "0"
+CACHE_DIR = os.getenv("AUTODOCS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "autodocs"))
+CACHE_MAX_BYTES = int(float(os.getenv("AUTODOCS_CACHE_MB", "200")) * 1024 * 1024)
+
+
+def content_key(*parts: Any) -> str:
+    """SHA-256 over JSON-serializable parts (e.g. a content hash plus request parameters)"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of API results.
+
+    Each entry is a small JSON file at <directory>/<kind>/<key[:2]>/<key>.json.
+    A hit refreshes the file's mtime, so when the cache grows past
+    `max_bytes` the least recently used entries are deleted first (down to
+    90% of the limit). Safe to share between threads.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size = sum(os.path.getsize(path) for path in self._entries())
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.directory, kind, key[:2], f"{key}.json")
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    yield os.path.join(root, name)
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """Cached value for `key`, or None"""
+        path = self._path(kind, key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)["value"]
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, kind: str, key: str, value: Any):
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps({"value": value}, ensure_ascii=False).encode("utf-8")
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        # Write-then-rename so a concurrent reader never sees a partial entry
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._size += len(data) - previous
+            if self._size > self.max_bytes:
+                self._evict(int(self.max_bytes * 0.9))
+
+    def _evict(self, target: int):
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def result_cache() -> Optional[ResultCache]:
+    """The process-wide cache, or None when disabled"""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
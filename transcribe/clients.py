@@ -0,0 +1,190 @@
+import asyncio
+import contextlib
+import os
+import threading
+import weakref
+from typing import Dict
+
+import httpx
+import requests
+from openai import AsyncAzureOpenAI, AzureOpenAI
+from requests.adapters import HTTPAdapter
+
+# Connection pool size per host; enough for the parallel chunk uploads
+POOL_SIZE = int(os.getenv("AUTODOCS_POOL_SIZE", "8"))
+# (connect, read) timeouts in seconds
+WHISPER_TIMEOUT = (10.0, float(os.getenv("WHISPER_TIMEOUT", "120")))
+OPENAI_TIMEOUT = httpx.Timeout(float(os.getenv("AZURE_OPENAI_TIMEOUT", "30")), connect=10.0)
+OPENAI_API_VERSION = "2024-02-15-preview"
+# Requests in flight at once through the async API (per event loop)
+MAX_IN_FLIGHT = int(os.getenv("AUTODOCS_MAX_IN_FLIGHT", "8"))
+
+# Shared, lazily created clients: one TCP/TLS connection pool per service,
+# reused by every clip processed in this process
+_lock = threading.Lock()
+_whisper = None  # (session, config)
+_openai = None  # (client, config)
+# Async clients and the in-flight semaphore belong to one event loop each
+_async = weakref.WeakKeyDictionary()  # loop -> {"whisper", "openai", "semaphore", "users"}
+
+
+def _require(*names: str) -> Dict[str, str]:
+    values = {name: os.getenv(name) for name in names}
+    for name, value in values.items():
+        if not value:
+            raise ValueError(f"Missing {name} environment variable")
+    return values
+
+
+def whisper_session():
+    """
+    Keep-alive requests session for the Whisper endpoint, with credentials
+    validated once.
+
+    Returns:
+        (session, config) where config has endpoint and timeout
+    """
+    global _whisper
+    with _lock:
+        if _whisper is None:
+            env = _require("WHISPER_ENDPOINT", "WHISPER_KEY")
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["api-key"] = env["WHISPER_KEY"]
+            _whisper = (session, {"endpoint": env["WHISPER_ENDPOINT"], "timeout": WHISPER_TIMEOUT})
+        return _whisper
+
+
+def openai_client():
+    """
+    Shared AzureOpenAI client on a pooled keep-alive HTTP client, with
+    credentials validated once.
+
+    Returns:
+        (client, config) where config has endpoint and deployment
+    """
+    global _openai
+    with _lock:
+        if _openai is None:
+            env = _require("AZURE_OPENAI_API_KEY", "AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_DEPLOYMENT")
+            print(f"Connecting to Azure OpenAI endpoint: {env['AZURE_OPENAI_ENDPOINT']}")
+            print(f"Using deployment: {env['AZURE_OPENAI_DEPLOYMENT']}")
+            http_client = httpx.Client(
+                timeout=OPENAI_TIMEOUT,
+                limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+            )
+            client = AzureOpenAI(
+                api_key=env["AZURE_OPENAI_API_KEY"],
+                api_version=OPENAI_API_VERSION,
+                azure_endpoint=env["AZURE_OPENAI_ENDPOINT"],
+                timeout=OPENAI_TIMEOUT,
+                http_client=http_client,
+                max_retries=0,  # retries are paced by transcribe.rate_limit
+            )
+            _openai = (client, {"endpoint": env["AZURE_OPENAI_ENDPOINT"],
+                                "deployment": env["AZURE_OPENAI_DEPLOYMENT"]})
+        return _openai
+
+
+def _async_clients() -> Dict:
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async.get(loop)
+        if clients is None:
+            clients = {"semaphore": asyncio.Semaphore(MAX_IN_FLIGHT), "users": 0}
+            _async[loop] = clients
+        return clients
+
+
+def request_slot() -> asyncio.Semaphore:
+    """Semaphore bounding async requests in flight on the running loop (MAX_IN_FLIGHT)"""
+    return _async_clients()["semaphore"]
+
+
+def async_whisper_client():
+    """
+    Pooled httpx.AsyncClient for the Whisper endpoint on the running loop.
+
+    Returns:
+        (client, config) where config has endpoint
+    """
+    clients = _async_clients()
+    if "whisper" not in clients:
+        env = _require("WHISPER_ENDPOINT", "WHISPER_KEY")
+        client = httpx.AsyncClient(
+            headers={"api-key": env["WHISPER_KEY"]},
+            timeout=httpx.Timeout(WHISPER_TIMEOUT[1], connect=WHISPER_TIMEOUT[0]),
+            limits=httpx.Limits(max_connections=MAX_IN_FLIGHT, max_keepalive_connections=MAX_IN_FLIGHT),
+        )
+        clients["whisper"] = (client, {"endpoint": env["WHISPER_ENDPOINT"]})
+    return clients["whisper"]
+
+
+def async_openai_client():
+    """
+    AsyncAzureOpenAI client on the running loop.
+
+    Returns:
+        (client, config) where config has endpoint and deployment
+    """
+    clients = _async_clients()
+    if "openai" not in clients:
+        env = _require("AZURE_OPENAI_API_KEY", "AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_DEPLOYMENT")
+        http_client = httpx.AsyncClient(
+            timeout=OPENAI_TIMEOUT,
+            limits=httpx.Limits(max_connections=MAX_IN_FLIGHT, max_keepalive_connections=MAX_IN_FLIGHT),
+        )
+        client = AsyncAzureOpenAI(
+            api_key=env["AZURE_OPENAI_API_KEY"],
+            api_version=OPENAI_API_VERSION,
+            azure_endpoint=env["AZURE_OPENAI_ENDPOINT"],
+            timeout=OPENAI_TIMEOUT,
+            http_client=http_client,
+            max_retries=0,  # retries are paced by transcribe.rate_limit
+        )
+        clients["openai"] = (client, {"endpoint": env["AZURE_OPENAI_ENDPOINT"],
+                                      "deployment": env["AZURE_OPENAI_DEPLOYMENT"]})
+    return clients["openai"]
+
+
+async def close_async_clients():
+    """Close the running loop's async clients (call before the loop ends)"""
+    clients = _async.pop(asyncio.get_running_loop(), {})
+    if "whisper" in clients:
+        await clients["whisper"][0].aclose()
+    if "openai" in clients:
+        await clients["openai"][0].close()
+
+
+@contextlib.asynccontextmanager
+async def async_clients_scope():
+    """
+    Keep the running loop's async clients open for the block. Scopes can
+    overlap (e.g. concurrent process_clip_async calls); the last one to exit
+    closes the clients, so every asyncio.run() releases its connection pools.
+    """
+    clients = _async_clients()
+    with _lock:
+        clients["users"] += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            clients["users"] -= 1
+            last = clients["users"] == 0
+        if last:
+            await close_async_clients()
+
+
+def reset_clients():
+    """Close the shared clients, e.g. after credentials in the environment change"""
+    global _whisper, _openai
+    with _lock:
+        if _whisper is not None:
+            _whisper[0].close()
+        if _openai is not None:
+            _openai[0].close()
+        _whisper = None
+        _openai = None
@@ -0,0 +1,144 @@
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from transcribe.rate_limit import estimate_tokens
+
+# Transcript tokens sent for one summary; longer transcripts are cut down to
+# this by extractive selection
+SUMMARY_INPUT_TOKENS = int(os.getenv("SUMMARY_INPUT_TOKENS", "3000"))
+# Share of the budget kept verbatim from the start and the end of a long
+# transcript (the setup and the result of a tutorial step); the rest goes to
+# the most informative sentences in between
+HEAD_SHARE = 0.3
+TAIL_SHARE = 0.2
+# Unpunctuated stretches are cut into pieces of this many words
+MAX_SENTENCE_WORDS = 40
+GAP_MARKER = "[...]"
+
+# Hesitations and verbal tics that carry nothing for a summary. Only the
+# lowercase forms are dropped anywhere; a capitalized one must read as a
+# hesitation ("Um, ...") so that "Er 404" or "Ah" as a name survive
+_FILLERS = re.compile(r"\b(?:u+h+m*|u+m+|e+r+m*|a+h+|h+m+|mhm)\b,?\s*"
+                      r"|\b(?:U+h+m*|U+m+|E+r+m*|H+m+|Mhm),\s*"
+                      r"|\b(?:[Yy]ou know|I mean),\s*")
+# A word or short phrase immediately repeated ("the the", "click the, click
+# the button"); words only, since repeated numbers ("10 10") are data. Which
+# repeats are disfluencies is decided by _collapse_repeat
+_REPEATS = re.compile(r"\b([^\W\d_]+(?:\s+[^\W\d_]+){0,4})(?:([\s,]+)\1\b)+", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset(
+    "the a an and or but so to of in on at for with from by is are was were be been it this that "
+    "these those you your we our i me my they them then just now here there what which when will "
+    "can going gonna want like okay right yeah".split()
+)
+# Sentences made only of these (and stopwords) are pleasantries Whisper tends
+# to loop on ("Thank you. Thank you.")
+_PLEASANTRIES = frozenset("thank thanks bye goodbye alright um uh hmm".split())
+
+
+def _collapse_repeat(match: re.Match) -> str:
+    """
+    A stammered function word ("the the") or a restarted phrase ("click the,
+    click the") becomes one; anything else, such as repeated key presses
+    ("Press Tab Tab", "Ctrl Z Z"), is kept as said
+    """
+    words = match.group(1).lower().split()
+    restarted = len(words) > 1 and ("," in match.group(2) or words[-1] in _STOPWORDS)
+    if restarted or (len(words) == 1 and words[0] in _STOPWORDS):
+        return match.group(1)
+    return match.group(0)
+
+
+def clean_transcript(text: str) -> str:
+    """Drop filler words, stammered repetitions and looped pleasantries"""
+    text = _FILLERS.sub("", text)
+    text = _REPEATS.sub(_collapse_repeat, text)
+
+    # Whisper sometimes loops on a phrase ("Thank you. Thank you. ..."). Only
+    # such pleasantries are deduplicated: a repeated instruction ("Press Tab.
+    # Press Tab.") is a repeated step
+    previous = None
+    sentences = []
+    for sentence in _SENTENCE_END.split(text):
+        words = _WORD.findall(sentence.lower())
+        key = " ".join(words)
+        if key and key == previous and all(w in _STOPWORDS or w in _PLEASANTRIES for w in words):
+            continue
+        previous = key
+        sentences.append(sentence)
+    return re.sub(r"\s+", " ", " ".join(sentences)).strip()
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences, with unpunctuated runs split every MAX_SENTENCE_WORDS words"""
+    pieces = []
+    for sentence in _SENTENCE_END.split(text):
+        words = sentence.split()
+        for i in range(0, len(words), MAX_SENTENCE_WORDS):
+            pieces.append(" ".join(words[i:i + MAX_SENTENCE_WORDS]))
+    return [piece for piece in pieces if piece]
+
+
+def select_sentences(sentences: List[str], max_tokens: int) -> List[str]:
+    """
+    Keep sentences from the start and end verbatim, then fill the remaining
+    budget with the middle sentences densest in the transcript's recurring
+    content words, in their original order. Gaps are marked with GAP_MARKER.
+    """
+    tokens = [estimate_tokens(sentence) for sentence in sentences]
+    keep = [False] * len(sentences)
+    used = 0
+
+    head_budget = int(max_tokens * HEAD_SHARE)
+    head_end = 0
+    while head_end < len(sentences) and used + tokens[head_end] <= head_budget:
+        keep[head_end] = True
+        used += tokens[head_end]
+        head_end += 1
+
+    tail_budget = used + int(max_tokens * TAIL_SHARE)
+    tail_start = len(sentences)
+    while tail_start - 1 > head_end and used + tokens[tail_start - 1] <= tail_budget:
+        tail_start -= 1
+        keep[tail_start] = True
+        used += tokens[tail_start]
+
+    frequency = Counter(word for sentence in sentences for word in _WORD.findall(sentence.lower())
+                        if word not in _STOPWORDS and len(word) > 2)
+
+    def density(i):
+        words = set(_WORD.findall(sentences[i].lower()))
+        return sum(frequency[word] for word in words if word in frequency) / tokens[i]
+
+    for i in sorted(range(head_end, tail_start), key=density, reverse=True):
+        if used + tokens[i] <= max_tokens:
+            keep[i] = True
+            used += tokens[i]
+
+    selected = []
+    for i, sentence in enumerate(sentences):
+        if keep[i]:
+            selected.append(sentence)
+        elif not selected or selected[-1] != GAP_MARKER:
+            selected.append(GAP_MARKER)
+    return selected
+
+
+def compact_transcript(text: str, max_tokens: int = SUMMARY_INPUT_TOKENS) -> Tuple[str, Dict]:
+    """
+    Transcript as sent for summarization: cleaned of fillers and repeats,
+    and capped at `max_tokens` by extractive selection.
+
+    Returns:
+        (text, info) where info has tokens (original estimate),
+        compacted_tokens and capped
+    """
+    tokens = estimate_tokens(text)
+    compacted = clean_transcript(text)
+    capped = estimate_tokens(compacted) > max_tokens
+    if capped:
+        compacted = " ".join(select_sentences(split_sentences(compacted), max_tokens))
+    return compacted, {"tokens": tokens, "compacted_tokens": estimate_tokens(compacted), "capped": capped}
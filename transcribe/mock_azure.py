@@ -0,0 +1,311 @@
+"""
+Local stand-in for the Azure Whisper and Azure OpenAI chat-completions
+endpoints, for exercising and benchmarking the processing pipeline without
+credentials or network access.
+
+    python -m transcribe.mock_azure --port 8765 --latency 0.3 --throttle-rate 0.05
+
+then point the clients at it (any key and deployment name will do):
+
+    WHISPER_ENDPOINT=http://127.0.0.1:8765/openai/deployments/whisper/audio/transcriptions
+    AZURE_OPENAI_ENDPOINT=http://127.0.0.1:8765
+
+Responses are derived from the request content, and injected failures from
+the seed and the request's sequence number, so a run with the same inputs
+and settings is repeatable. GET /stats returns per-endpoint counters.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from transcribe.rate_limit import TokenBucket
+
+# Vocabulary for the deterministic fake transcripts
+WORDS = ("open the settings panel click save select file menu then choose export "
+         "type your name press enter and wait for the upload to finish").split()
+
+
+class MockBehavior:
+    """
+    How the stand-in responds.
+
+    Args:
+        latency: Base seconds per request
+        jitter: Random +/- fraction applied to every delay
+        seconds_per_mb: Extra Whisper processing time per MB uploaded
+        token_latency: Seconds per generated chat token (also the streaming pace)
+        error_rate: Probability of an injected 500/503
+        throttle_rate: Probability of an injected 429
+        retry_after: Retry-After seconds sent with injected 429s
+        rpm: Requests per minute allowed per endpoint (None = unlimited)
+        max_concurrency: Requests in flight allowed per endpoint (None = unlimited)
+        seed: Seed for jitter and failure injection
+    """
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.0, seconds_per_mb: float = 0.5,
+                 token_latency: float = 0.01, error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: float = 1.0, rpm: Optional[float] = None,
+                 max_concurrency: Optional[int] = None, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.seconds_per_mb = seconds_per_mb
+        self.token_latency = token_latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.rpm = rpm
+        self.max_concurrency = max_concurrency
+        self.seed = seed
+
+
+class _Endpoint:
+    """Quota and counters for one endpoint (whisper or chat)"""
+
+    def __init__(self, behavior: MockBehavior):
+        self.bucket = TokenBucket(behavior.rpm) if behavior.rpm else None
+        self.in_flight = 0
+        self.stats = {"requests": 0, "ok": 0, "errors": 0, "throttled": 0, "rate_limited": 0,
+                      "peak_in_flight": 0, "bytes_in": 0, "tokens_out": 0}
+
+
+class MockAzureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, behavior: MockBehavior):
+        super().__init__(address, _Handler)
+        self.behavior = behavior
+        self.endpoints = {"whisper": _Endpoint(behavior), "chat": _Endpoint(behavior)}
+        self.sequence = 0
+        self.lock = threading.Lock()
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {name: dict(endpoint.stats) for name, endpoint in self.endpoints.items()}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: MockAzureServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.server.stats())
+        else:
+            self._send_json(404, {"error": {"code": "NotFound", "message": self.path}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if "/chat/completions" in self.path:
+            name = "chat"
+        elif "/audio/transcriptions" in self.path:
+            name = "whisper"
+        else:
+            self._send_json(404, {"error": {"code": "NotFound", "message": self.path}})
+            return
+        if not self.headers.get("api-key") and not self.headers.get("authorization"):
+            self._send_json(401, {"error": {"code": "401", "message": "Missing api-key header"}})
+            return
+
+        server = self.server
+        behavior = server.behavior
+        endpoint = server.endpoints[name]
+        with server.lock:
+            server.sequence += 1
+            rng = random.Random(f"{behavior.seed}:{server.sequence}")
+            endpoint.stats["requests"] += 1
+            endpoint.stats["bytes_in"] += len(body)
+            rejection = self._admit(endpoint, rng)
+            if rejection is None:
+                endpoint.in_flight += 1
+                endpoint.stats["peak_in_flight"] = max(endpoint.stats["peak_in_flight"], endpoint.in_flight)
+        if rejection is not None:
+            status, headers = rejection
+            self._send_json(status, {"error": {"code": str(status), "message": "Injected by mock_azure"}},
+                            headers)
+            return
+
+        try:
+            if name == "whisper":
+                tokens = self._transcribe(body, rng)
+            else:
+                tokens = self._chat(json.loads(body), rng)
+            with server.lock:
+                endpoint.stats["ok"] += 1
+                endpoint.stats["tokens_out"] += tokens
+        finally:
+            with server.lock:
+                endpoint.in_flight -= 1
+
+    def _admit(self, endpoint: _Endpoint, rng: random.Random):
+        """None to serve the request, or (status, headers) to reject it (called under the lock)"""
+        behavior = self.server.behavior
+        if behavior.max_concurrency is not None and endpoint.in_flight >= behavior.max_concurrency:
+            endpoint.stats["rate_limited"] += 1
+            return 429, {"Retry-After": "1"}
+        if endpoint.bucket is not None:
+            wait = endpoint.bucket.reserve(1, time.monotonic())
+            if wait > 0:
+                endpoint.bucket.level += 1  # rejected requests don't use quota
+                endpoint.stats["rate_limited"] += 1
+                return 429, {"retry-after-ms": str(int(wait * 1000) + 1),
+                             "Retry-After": str(int(wait) + 1)}
+
+        roll = rng.random()
+        if roll < behavior.throttle_rate:
+            endpoint.stats["throttled"] += 1
+            return 429, {"Retry-After": f"{behavior.retry_after:g}"}
+        if roll < behavior.throttle_rate + behavior.error_rate:
+            endpoint.stats["errors"] += 1
+            return rng.choice((500, 503)), {}
+        return None
+
+    def _delay(self, seconds: float, rng: random.Random):
+        jitter = self.server.behavior.jitter
+        time.sleep(max(0.0, seconds * (1 + rng.uniform(-jitter, jitter))))
+
+    def _transcribe(self, body: bytes, rng: random.Random) -> int:
+        """Whisper: a transcript chosen by the upload's hash, longer for bigger uploads"""
+        behavior = self.server.behavior
+        self._delay(behavior.latency + behavior.seconds_per_mb * len(body) / 1e6, rng)
+        # The multipart boundary is random per request; leave it out of the hash
+        boundary = re.search(r"boundary=(\S+)", self.headers.get("Content-Type", ""))
+        content = body.replace(boundary.group(1).encode(), b"") if boundary else body
+        digest = hashlib.sha256(content).digest()
+        count = 8 + len(body) // 20000
+        text = " ".join(WORDS[digest[i % len(digest)] % len(WORDS)] for i in range(count)).capitalize() + "."
+
+        form = re.search(rb'name="response_format"\r\n\r\n(\w+)', body)
+        if form and form.group(1) in (b"json", b"verbose_json"):
+            self._send_json(200, {"text": text})
+        else:
+            self._send(200, text.encode("utf-8"), "text/plain")
+        return count
+
+    def _chat(self, request: Dict, rng: random.Random) -> int:
+        """Chat completions: summaries built from the prompt, optionally streamed"""
+        behavior = self.server.behavior
+        prompt = request["messages"][-1]["content"]
+        if (request.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps({"summaries": [
+                {"id": item["id"], "summary": _summarize(item["transcript"])}
+                for item in json.loads(prompt).get("transcripts", [])
+            ]})
+        else:
+            content = _summarize(prompt.split("\n\n", 1)[-1])
+            content = " ".join(content.split(" ")[:request.get("max_tokens") or None])
+        words = content.split(" ")
+
+        if request.get("stream"):
+            self._stream(content, words, rng)
+            return len(words)
+
+        self._delay(behavior.latency + behavior.token_latency * len(words), rng)
+        prompt_tokens = sum(len(message["content"]) for message in request["messages"]) // 4 + 1
+        self._send_json(200, {
+            "id": "chatcmpl-mock", "object": "chat.completion", "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(words),
+                      "total_tokens": prompt_tokens + len(words)},
+        })
+        return len(words)
+
+    def _stream(self, content: str, words, rng: random.Random):
+        """Server-sent events, one word per chunk, like Azure's streaming responses"""
+        behavior = self.server.behavior
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(choices):
+            chunk = {"id": "chatcmpl-mock", "object": "chat.completion.chunk",
+                     "created": int(time.time()), "model": "mock", "choices": choices}
+            self.wfile.write(b"data: " + json.dumps(chunk).encode("utf-8") + b"\n\n")
+            self.wfile.flush()
+
+        self._delay(behavior.latency, rng)
+        event([])  # Azure leads with a content-filter-only chunk
+        for i, word in enumerate(words):
+            if i:
+                self._delay(behavior.token_latency, rng)
+            event([{"index": 0, "finish_reason": None,
+                    "delta": {"content": word if i == 0 else " " + word}}])
+        event([{"index": 0, "finish_reason": "stop", "delta": {}}])
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, payload, headers: Optional[Dict] = None):
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def _send(self, status: int, data: bytes, content_type: str, headers: Optional[Dict] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _summarize(transcript: str) -> str:
+    """First words of the transcript as a one-sentence 'summary'"""
+    words = transcript.split()[:25] or ["Nothing", "to", "summarize"]
+    return "**Summary:** " + " ".join(words).rstrip(".") + "."
+
+
+def start_server(host: str = "127.0.0.1", port: int = 8765,
+                 behavior: Optional[MockBehavior] = None) -> MockAzureServer:
+    """Serve in a daemon thread (port 0 picks a free port); stop with server.shutdown()"""
+    server = MockAzureServer((host, port), behavior or MockBehavior())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Azure Whisper and OpenAI endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Base seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- fraction on delays")
+    parser.add_argument("--seconds-per-mb", type=float, default=0.5, help="Whisper time per MB uploaded")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="Seconds per generated token")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 5xx")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests given a 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After for injected 429s")
+    parser.add_argument("--rpm", type=float, default=None, help="Requests per minute per endpoint")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Requests in flight per endpoint")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    behavior = MockBehavior(latency=args.latency, jitter=args.jitter, seconds_per_mb=args.seconds_per_mb,
+                            token_latency=args.token_latency, error_rate=args.error_rate,
+                            throttle_rate=args.throttle_rate, retry_after=args.retry_after, rpm=args.rpm,
+                            max_concurrency=args.max_concurrency, seed=args.seed)
+    server = MockAzureServer((args.host, args.port), behavior)
+    host, port = server.server_address[:2]
+    print(f"Mock Azure endpoints on http://{host}:{port}")
+    print(f"  WHISPER_ENDPOINT=http://{host}:{port}/openai/deployments/whisper/audio/transcriptions")
+    print(f"  AZURE_OPENAI_ENDPOINT=http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
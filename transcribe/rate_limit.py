@@ -0,0 +1,206 @@
+import asyncio
+import email.utils
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+import requests
+
+try:
+    import tiktoken
+except ImportError:  # optional: without it token counts are estimated from length
+    tiktoken = None
+
+# Azure quotas for our deployments (requests / tokens per minute)
+WHISPER_RPM = float(os.getenv("WHISPER_RPM", "50"))
+AZURE_OPENAI_RPM = float(os.getenv("AZURE_OPENAI_RPM", "60"))
+AZURE_OPENAI_TPM = float(os.getenv("AZURE_OPENAI_TPM", "30000"))
+
+# Status codes worth retrying: throttling and transient server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Continuously refilling bucket of `per_minute` tokens. Azure enforces
+    quotas over short windows, so the burst size is a tenth of a minute's
+    worth (at least one request).
+
+    reserve() takes tokens immediately, letting the level go negative, and
+    returns how long the caller must wait before its request fits the rate;
+    concurrent callers therefore queue up in order without holding a lock
+    while they wait. A request larger than the bucket goes ahead once the
+    bucket is full, and the debt it leaves delays the requests after it.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = 6.0):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        wait = max(0.0, min(amount, self.capacity) - self.level) / self.rate
+        self.level -= amount
+        return wait
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """Server-requested delay from retry-after-ms / Retry-After (seconds or HTTP date)"""
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None  # malformed header: fall back to our own backoff
+    return max(0.0, parsed.timestamp() - time.time()) if parsed else None
+
+
+def classify_error(e: Exception) -> Tuple[bool, Optional[int], Optional[float]]:
+    """
+    Decide whether a failed request should be retried.
+
+    Works for requests, httpx and openai exceptions.
+
+    Returns:
+        (retryable, status code or None, Retry-After seconds or None)
+    """
+    if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                      httpx.TransportError)):
+        return True, None, None
+    if type(e).__name__ in ("APIConnectionError", "APITimeoutError"):  # openai
+        return True, None, None
+
+    response = getattr(e, "response", None)
+    status = getattr(e, "status_code", None) or getattr(response, "status_code", None)
+    if status is None:
+        return False, None, None
+    headers = getattr(response, "headers", None)
+    return status in RETRYABLE_STATUS, status, retry_after_seconds(headers)
+
+
+class RequestScheduler:
+    """
+    Shared pacing and retry policy for one API.
+
+    Every request first reserves one request from the RPM bucket and its
+    estimated tokens from the TPM bucket, and sleeps until both fit, so a
+    batch runs at the quota ceiling instead of bursting into 429s. A
+    throttled response's Retry-After pauses all requests to that API, not
+    just the one that got it. Transient failures are retried with
+    full-jitter exponential backoff.
+    """
+
+    def __init__(self, name: str, rpm: float, tpm: Optional[float] = None, max_attempts: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        self.name = name
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm) if tpm else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "throttled": 0, "failed": 0, "wait_seconds": 0.0}
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            delay = max(self._paused_until - now, self._requests.reserve(1, now))
+            if self._tokens is not None and tokens:
+                delay = max(delay, self._tokens.reserve(tokens, now))
+            self._stats["requests"] += 1
+            self._stats["wait_seconds"] += delay
+            return delay
+
+    def _after_failure(self, e: Exception, attempt: int) -> float:
+        """Delay before retrying, or re-raise if the error is final"""
+        retryable, status, retry_after = classify_error(e)
+        if not retryable or attempt == self.max_attempts - 1:
+            with self._lock:
+                self._stats["failed"] += 1
+            raise e
+
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        with self._lock:
+            self._stats["retries"] += 1
+            if status == 429:
+                self._stats["throttled"] += 1
+            if retry_after is not None:
+                # The server knows when quota frees up; hold every request until then
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                backoff = 0.0
+        print(f"{self.name}: retrying after {'HTTP ' + str(status) if status else type(e).__name__}"
+              f" (attempt {attempt + 2}/{self.max_attempts})")
+        return backoff
+
+    def run(self, request: Callable[[], object], tokens: int = 0):
+        """Call request() within the quota, retrying transient failures"""
+        for attempt in range(self.max_attempts):
+            time.sleep(self._reserve(tokens))
+            try:
+                return request()
+            except Exception as e:
+                time.sleep(self._after_failure(e, attempt))
+
+    async def run_async(self, request: Callable[[], Awaitable], tokens: int = 0):
+        """Async run(): `request` returns a new awaitable per attempt"""
+        for attempt in range(self.max_attempts):
+            await asyncio.sleep(self._reserve(tokens))
+            try:
+                return await request()
+            except Exception as e:
+                await asyncio.sleep(self._after_failure(e, attempt))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        return stats
+
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def _token_encoding():
+    """GPT-4o's tokenizer, or False when tiktoken or its vocabulary file is unavailable"""
+    global _encoding
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                _encoding = tiktoken.get_encoding("o200k_base") if tiktoken else False
+            except Exception:  # the vocabulary is downloaded on first use
+                _encoding = False
+        return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count of text: exact with tiktoken, otherwise about four characters per token"""
+    encoding = _token_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=())) + 1
+    return len(text) // 4 + 1
+
+
+# One scheduler per API, shared by every sync and async call in the process
+WHISPER_SCHEDULER = RequestScheduler("Whisper", rpm=WHISPER_RPM)
+OPENAI_SCHEDULER = RequestScheduler("Azure OpenAI", rpm=AZURE_OPENAI_RPM, tpm=AZURE_OPENAI_TPM)
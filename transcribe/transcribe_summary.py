@@ -1,39 +1,157 @@
-from openai import AzureOpenAI
 import os 
 import requests 
 import requests.exceptions
 from dotenv import load_dotenv
 import re
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 
 load_dotenv()
 
+from transcribe.audio_upload import prepare_upload
+from transcribe.clients import (async_openai_client, async_whisper_client, openai_client,
+                               request_slot, whisper_session, OPENAI_API_VERSION)
+from transcribe.cache import content_key, file_digest, result_cache
+from transcribe.compaction import compact_transcript
+from transcribe.rate_limit import OPENAI_SCHEDULER, WHISPER_SCHEDULER, estimate_tokens
+
+
+
+# Chunks of a long recording transcribed at once
+TRANSCRIBE_WORKERS = int(os.getenv("WHISPER_WORKERS", "4"))
+WHISPER_PARAMS = {"response_format": "text", "language": "en"}
+
+# Batch summarization: prompt tokens per request, clips per request, and
+# output tokens allowed per clip
+BATCH_TOKEN_BUDGET = int(os.getenv("SUMMARY_BATCH_TOKENS", "6000"))
+BATCH_MAX_CLIPS = 10
+BATCH_SUMMARY_TOKENS = 200
+BATCH_SYSTEM_PROMPT = (
+    "You are a helpful assistant that summarizes tutorials into clear instructions. "
+    "You will receive several tutorial transcripts, each with an id. Summarize each one "
+    "into a 1 step short 2-3 sentence summary. Reply with JSON only, in the form "
+    '{"summaries": [{"id": "<id>", "summary": "<summary>"}]}, with one entry per transcript.'
+)
 
 
 def transcribe_audio(file_path):
     """
     Transcibe local audio file using Azure OpenAI Whisper API.
+
+    The recording is uploaded as 16 kHz mono FLAC/Opus (see
+    transcribe.audio_upload) rather than the raw 48 kHz WAV. Long recordings
+    are split at silences and the chunks are transcribed concurrently, then
+    joined back in order.
     """
+    return join_chunks(transcribe_chunks(file_path))
 
-    whisper_url = os.getenv("WHISPER_ENDPOINT")
-    whisper_key = os.getenv("WHISPER_KEY")
 
-    if not whisper_url or not whisper_key:
-        raise ValueError("Missing WHISPER_ENDPOINT or WHISPER_KEY environment variable.")
+def join_chunks(chunks):
+    """Stitch chunk transcripts back into one text, in order"""
+    return " ".join(chunk["text"] for chunk in chunks if chunk["text"])
+
+
+def transcribe_chunks(file_path):
+    """
+    Transcribe a recording chunk by chunk.
+
+    Returns:
+        Chunks in order, each {"file", "start", "end", "text"} with its
+        offsets in seconds into the trimmed upload audio
+    """
+    chunks = prepare_upload(file_path)
+    if len(chunks) == 1:
+        return [dict(chunks[0], text=_transcribe_chunk(chunks[0]["file"]))]
+
+    print(f"Transcribing {len(chunks)} chunks in parallel...")
+    with ThreadPoolExecutor(max_workers=min(TRANSCRIBE_WORKERS, len(chunks))) as pool:
+        texts = list(pool.map(_transcribe_chunk, [chunk["file"] for chunk in chunks]))
+    return [dict(chunk, text=text) for chunk, text in zip(chunks, texts)]
+
+
+async def transcribe_audio_async(file_path):
+    """
+    Async transcribe_audio: the chunks are sent concurrently on the loop's
+    pooled httpx client, at most clients.MAX_IN_FLIGHT requests at a time
+    across everything running on the loop.
+    """
+    return join_chunks(await transcribe_chunks_async(file_path))
+
+
+async def transcribe_chunks_async(file_path):
+    """Async transcribe_chunks; see transcribe_chunks for the result"""
+    # Resampling/encoding is CPU work; keep it off the event loop
+    chunks = await asyncio.to_thread(prepare_upload, file_path)
+    texts = await asyncio.gather(*(_transcribe_chunk_async(chunk["file"]) for chunk in chunks))
+    return [dict(chunk, text=text) for chunk, text in zip(chunks, texts)]
 
-    headers = {
-        "api-key": whisper_key,
-    }
+
+async def _transcribe_chunk_async(file_path):
+    cache, key = _transcript_cache(file_path)
+    if key is not None:
+        cached = cache.get("transcript", key)
+        if cached is not None:
+            return cached
+
+    text = await WHISPER_SCHEDULER.run_async(lambda: _transcribe_file_async(file_path))
+
+    if key is not None:
+        cache.put("transcript", key, text)
+    return text
+
+
+async def _transcribe_file_async(file_path):
+    client, config = async_whisper_client()
+    with open(file_path, "rb") as audio_file:
+        content = audio_file.read()
+    files = {"file": (os.path.basename(file_path), content, "application/octet-stream")}
+    async with request_slot():
+        response = await client.post(config["endpoint"], files=files, data=WHISPER_PARAMS)
+    response.raise_for_status()
+    return response.text.strip()
+
+
+def _transcribe_chunk(file_path):
+    """
+    Transcribe one upload file, paced to the Whisper quota and retried alone
+    on transient failures. Results are cached by the audio's content hash.
+    """
+    cache, key = _transcript_cache(file_path)
+    if key is not None:
+        cached = cache.get("transcript", key)
+        if cached is not None:
+            return cached
+
+    text = WHISPER_SCHEDULER.run(lambda: _transcribe_file(file_path))
+
+    if key is not None:
+        cache.put("transcript", key, text)
+    return text
+
+
+def _transcript_cache(file_path):
+    """(cache, key) for a chunk's transcript, or (None, None) with caching off"""
+    cache = result_cache()
+    if cache is None:
+        return None, None
+    return cache, content_key("whisper", file_digest(file_path), WHISPER_PARAMS)
+
+
+def _transcribe_file(file_path):
+    """Send a single audio file to the Whisper endpoint"""
+
+    session, config = whisper_session()
 
     with open(file_path, "rb") as audio_file:
         files = {
             "file": (os.path.basename(file_path), audio_file, "application/octet-stream"),
         }
-        data = {
-            "response_format": "text",
-            "language": "en"
-        }
-
-        response = requests.post(whisper_url, headers=headers, files=files, data=data)
+        response = session.post(config["endpoint"], files=files, data=WHISPER_PARAMS,
+                                timeout=config["timeout"])
         response.raise_for_status()
 
 
@@ -46,74 +164,443 @@ def transcribe_audio(file_path):
 def summarize_transcription(transcript):
     """
     Summarize the transcription using Azure OpenAI GPT-4o.
+
+    The transcript is compacted first (fillers and repeats removed, capped
+    at compaction.SUMMARY_INPUT_TOKENS), so cost and latency stay bounded
+    however long the clip is.
     """
     try:
-        # Validate environment variables first
-        api_key = os.getenv("AZURE_OPENAI_API_KEY")
-        endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT")
-        
-        if not api_key:
-            raise ValueError("Missing AZURE_OPENAI_API_KEY environment variable")
-        if not endpoint:
-            raise ValueError("Missing AZURE_OPENAI_ENDPOINT environment variable")
-        if not deployment:
-            raise ValueError("Missing AZURE_OPENAI_DEPLOYMENT environment variable")
-        
-        print(f"Connecting to Azure OpenAI endpoint: {endpoint}")
-        print(f"Using deployment: {deployment}")
-        
-        client = AzureOpenAI(
-            api_key=api_key,
-            api_version="2024-02-15-preview",
-            azure_endpoint=endpoint,
-            timeout=30.0  # Add timeout
-        )
+        # Shared client: credentials validated and connections kept alive across calls
+        client, config = openai_client()
+        transcript, compaction = compact_transcript(transcript)
+
+        # Same transcript, prompt and model settings -> cached summary
+        cache, key = _summary_cache(config, transcript)
+        if key is not None:
+            cached = cache.get("summary", key)
+            if cached is not None:
+                return cached
 
-        response = client.chat.completions.create(
-            model=deployment,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that summarizes tutorials into clear instructions."
-                },
-                {
-                    "role": "user",
-                    "content": f"Please summarize the following tutorial into a 1 step short 2-3 sentence summary:\n\n{transcript}"
-                }
-            ],
-            temperature=0.3,
-            max_tokens=800
+        # Paced to the RPM/TPM quota; 429s and transient errors are retried
+        request = _summary_request(transcript)
+        response = OPENAI_SCHEDULER.run(
+            lambda: client.chat.completions.create(model=config["deployment"], **request),
+            tokens=_request_tokens(request)
         )
+        result = _summary_result(response)
+        _record_usage(request, [compaction], response=response)
+        if key is not None:
+            cache.put("summary", key, result)
+        return result
         
-        if not response.choices or not response.choices[0].message:
-            raise ValueError("No valid response from the model.")
+    except Exception as e:
+        raise _summary_error(e)
 
-        result = response.choices[0].message.content
 
-        result = clean_summary(result)  # Clean the summary to remove unwanted formatting
+async def summarize_transcription_async(transcript):
+    """
+    Async summarize_transcription: shares the loop's AsyncAzureOpenAI client
+    and waits for a request slot (clients.MAX_IN_FLIGHT) before sending.
+    """
+    try:
+        client, config = async_openai_client()
+        transcript, compaction = compact_transcript(transcript)
+        cache, key = _summary_cache(config, transcript)
+        if key is not None:
+            cached = cache.get("summary", key)
+            if cached is not None:
+                return cached
+
+        request = _summary_request(transcript)
 
-        # Return the summarized content
+        async def send():
+            async with request_slot():
+                return await client.chat.completions.create(model=config["deployment"], **request)
+
+        response = await OPENAI_SCHEDULER.run_async(send, tokens=_request_tokens(request))
+        result = _summary_result(response)
+        _record_usage(request, [compaction], response=response)
+        if key is not None:
+            cache.put("summary", key, result)
         return result
-        
-    except requests.exceptions.ConnectionError as e:
-        print(f"Network connection error: {str(e)}")
-        raise Exception(f"Network connection error. Please check your internet connection and Azure OpenAI endpoint configuration.")
-    except requests.exceptions.Timeout as e:
-        print(f"Request timeout error: {str(e)}")
-        raise Exception(f"Request timed out. The Azure OpenAI service may be slow or unavailable.")
+
+    except Exception as e:
+        raise _summary_error(e)
+
+
+def summarize_transcription_stream(transcript, on_partial=None):
+    """
+    Streaming summarize_transcription: tokens are consumed as they arrive and
+    on_partial(text so far) is called after each one, so callers can show
+    the summary while it is being written.
+
+    Returns:
+        (summary, stats) where stats has ttft_ms (time to first token),
+        latency_ms (whole response), cached, and for requests actually made
+        input_tokens, output_tokens and transcript_tokens (before compaction)
+    """
+    try:
+        client, config = openai_client()
+        transcript, compaction = compact_transcript(transcript)
+        cache, key = _summary_cache(config, transcript)
+        if key is not None:
+            cached = cache.get("summary", key)
+            if cached is not None:
+                return cached, {"ttft_ms": None, "latency_ms": 0.0, "cached": True}
+
+        request = _summary_request(transcript)
+        timing = {}
+
+        def send():
+            # Timed per attempt; a retry starts the text over
+            start = time.perf_counter()
+            stream = client.chat.completions.create(model=config["deployment"], stream=True, **request)
+            parts = []
+            for chunk in stream:
+                _stream_delta(chunk, parts, start, timing, on_partial)
+            timing["latency_ms"] = _elapsed_ms(start)
+            return "".join(parts)
+
+        text = OPENAI_SCHEDULER.run(send, tokens=_request_tokens(request))
+        return _stream_result(cache, key, text, timing, request, compaction)
+
+    except Exception as e:
+        raise _summary_error(e)
+
+
+async def summarize_transcription_stream_async(transcript, on_partial=None):
+    """Async summarize_transcription_stream"""
+    try:
+        client, config = async_openai_client()
+        transcript, compaction = compact_transcript(transcript)
+        cache, key = _summary_cache(config, transcript)
+        if key is not None:
+            cached = cache.get("summary", key)
+            if cached is not None:
+                return cached, {"ttft_ms": None, "latency_ms": 0.0, "cached": True}
+
+        request = _summary_request(transcript)
+        timing = {}
+
+        async def send():
+            async with request_slot():
+                start = time.perf_counter()
+                stream = await client.chat.completions.create(model=config["deployment"], stream=True,
+                                                              **request)
+                parts = []
+                async for chunk in stream:
+                    _stream_delta(chunk, parts, start, timing, on_partial)
+                timing["latency_ms"] = _elapsed_ms(start)
+                return "".join(parts)
+
+        text = await OPENAI_SCHEDULER.run_async(send, tokens=_request_tokens(request))
+        return _stream_result(cache, key, text, timing, request, compaction)
+
     except Exception as e:
-        print(f"Error in summarize_transcription: {str(e)}")
-        print(f"Error type: {type(e).__name__}")
-        # Check if it's an authentication error
-        if "401" in str(e) or "unauthorized" in str(e).lower():
-            raise Exception(f"Authentication error. Please check your AZURE_OPENAI_API_KEY.")
-        elif "404" in str(e):
-            raise Exception(f"Service not found. Please check your AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_DEPLOYMENT.")
-        elif "429" in str(e):
-            raise Exception(f"Rate limit exceeded. Please wait and try again.")
+        raise _summary_error(e)
+
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _stream_delta(chunk, parts, start, timing, on_partial):
+    """Add one streamed chunk's text to parts, stamping the first token"""
+    # Azure sends a leading chunk with only content-filter results and no choices
+    if not chunk.choices:
+        return
+    content = chunk.choices[0].delta.content
+    if not content:
+        return
+    if not parts:
+        timing["ttft_ms"] = _elapsed_ms(start)
+    parts.append(content)
+    if on_partial is not None:
+        on_partial("".join(parts))
+
+
+def _stream_result(cache, key, text, timing, request, compaction):
+    if not text:
+        raise ValueError("No valid response from the model.")
+    result = clean_summary(text)
+    if key is not None:
+        cache.put("summary", key, result)
+    stats = {"ttft_ms": timing.get("ttft_ms"), "latency_ms": timing.get("latency_ms"), "cached": False}
+    stats.update(_record_usage(request, [compaction], text=text))
+    return result, stats
+
+
+def summarize_transcriptions(transcripts):
+    """
+    Summarize several clips' transcripts with as few requests as possible:
+    transcripts are packed into batches within BATCH_TOKEN_BUDGET and each
+    batch is one JSON-mode chat completion answering per clip ID. A failing
+    batch or single-clip request only fails its own clips.
+
+    Args:
+        transcripts: {clip id: transcript}
+
+    Returns:
+        ({clip id: summary}, {clip id: exception}) covering every clip
+    """
+    try:
+        client, config = openai_client()
+        compactions = {clip_id: compact_transcript(transcript) for clip_id, transcript in transcripts.items()}
+        summaries, pending = _cached_batch_summaries(config, compactions)
+    except Exception as e:
+        raise _summary_error(e)
+
+    errors = {}
+    for batch in plan_batches(pending):
+        request = _batch_request(batch)
+        try:
+            response = OPENAI_SCHEDULER.run(
+                lambda: client.chat.completions.create(model=config["deployment"], **request),
+                tokens=_request_tokens(request)
+            )
+            _record_usage(request, [compactions[clip_id][1] for clip_id in batch], response=response)
+            summaries.update(_batch_result(config, batch, response))
+        except Exception as e:
+            errors.update(dict.fromkeys(batch, _summary_error(e)))
+
+    # Anything the model left out of its answer gets a request of its own
+    for clip_id, transcript in transcripts.items():
+        if clip_id not in summaries and clip_id not in errors:
+            try:
+                summaries[clip_id] = summarize_transcription(transcript)
+            except Exception as e:
+                errors[clip_id] = e
+    return summaries, errors
+
+
+async def summarize_transcriptions_async(transcripts):
+    """Async summarize_transcriptions; the batches are sent concurrently"""
+    try:
+        client, config = async_openai_client()
+        compactions = {clip_id: compact_transcript(transcript) for clip_id, transcript in transcripts.items()}
+        summaries, pending = _cached_batch_summaries(config, compactions)
+    except Exception as e:
+        raise _summary_error(e)
+
+    async def send(batch):
+        request = _batch_request(batch)
+
+        async def create():
+            async with request_slot():
+                return await client.chat.completions.create(model=config["deployment"], **request)
+
+        response = await OPENAI_SCHEDULER.run_async(create, tokens=_request_tokens(request))
+        _record_usage(request, [compactions[clip_id][1] for clip_id in batch], response=response)
+        return _batch_result(config, batch, response)
+
+    errors = {}
+    batches = plan_batches(pending)
+    for batch, result in zip(batches, await asyncio.gather(*(send(batch) for batch in batches),
+                                                           return_exceptions=True)):
+        if isinstance(result, Exception):
+            errors.update(dict.fromkeys(batch, _summary_error(result)))
+        else:
+            summaries.update(result)
+
+    missing = [clip_id for clip_id in transcripts if clip_id not in summaries and clip_id not in errors]
+    for clip_id, result in zip(missing, await asyncio.gather(
+            *(summarize_transcription_async(transcripts[clip_id]) for clip_id in missing),
+            return_exceptions=True)):
+        if isinstance(result, Exception):
+            errors[clip_id] = result
+        else:
+            summaries[clip_id] = result
+    return summaries, errors
+
+
+def plan_batches(transcripts):
+    """
+    Split {clip id: transcript} into batches of at most BATCH_MAX_CLIPS whose
+    estimated prompt tokens stay within BATCH_TOKEN_BUDGET (a transcript
+    over the budget on its own goes alone)
+    """
+    batches = []
+    batch, batch_tokens = {}, 0
+    for clip_id, transcript in transcripts.items():
+        tokens = estimate_tokens(transcript)
+        if batch and (batch_tokens + tokens > BATCH_TOKEN_BUDGET or len(batch) >= BATCH_MAX_CLIPS):
+            batches.append(batch)
+            batch, batch_tokens = {}, 0
+        batch[clip_id] = transcript
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _batch_cache_key(config, transcript):
+    return content_key("summary-batch", config["deployment"], OPENAI_API_VERSION,
+                       BATCH_SYSTEM_PROMPT, transcript)
+
+
+def _cached_batch_summaries(config, compactions):
+    """
+    Split {clip id: (compacted transcript, info)} into ({clip id: cached
+    summary}, {clip id: compacted transcript still to do})
+    """
+    cache = result_cache()
+    summaries, pending = {}, {}
+    for clip_id, (transcript, _) in compactions.items():
+        cached = cache.get("summary", _batch_cache_key(config, transcript)) if cache else None
+        if cached is not None:
+            summaries[clip_id] = cached
         else:
-            raise Exception(f"Azure OpenAI error: {str(e)}")
+            pending[clip_id] = transcript
+    return summaries, pending
+
+
+def _batch_request(batch):
+    """JSON-mode chat completion arguments (besides the model) for a batch"""
+    items = [{"id": str(clip_id), "transcript": transcript} for clip_id, transcript in batch.items()]
+    return {
+        "messages": [
+            {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps({"transcripts": items}, ensure_ascii=False)}
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.3,
+        "max_tokens": BATCH_SUMMARY_TOKENS * len(batch) + 50,
+    }
+
+
+def _batch_result(config, batch, response):
+    """Map a batch's JSON answer back to {clip id: summary}, caching each"""
+    if not response.choices or not response.choices[0].message:
+        raise ValueError("No valid response from the model.")
+    try:
+        answer = json.loads(response.choices[0].message.content)
+        items = answer["summaries"]
+    except (TypeError, ValueError, KeyError):
+        print("Batch summary was not valid JSON; summarizing those clips one by one")
+        return {}
+
+    ids = {str(clip_id): clip_id for clip_id in batch}
+    cache = result_cache()
+    summaries = {}
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        clip_id = ids.get(str(item.get("id")))
+        if clip_id is None or not isinstance(item.get("summary"), str):
+            continue
+        summaries[clip_id] = clean_summary(item["summary"])
+        if cache is not None:
+            cache.put("summary", _batch_cache_key(config, batch[clip_id]), summaries[clip_id])
+    return summaries
+
+
+def _summary_cache(config, transcript):
+    """(cache, key) for a summary: transcript, prompt, model and sampling settings"""
+    cache = result_cache()
+    if cache is None:
+        return None, None
+    return cache, content_key("summary", config["deployment"], OPENAI_API_VERSION,
+                              _summary_request(transcript))
+
+
+def _summary_request(transcript):
+    """Chat completion arguments (besides the model) for summarizing a transcript"""
+    return {
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that summarizes tutorials into clear instructions."
+            },
+            {
+                "role": "user",
+                "content": f"Please summarize the following tutorial into a 1 step short 2-3 sentence summary:\n\n{transcript}"
+            }
+        ],
+        "temperature": 0.3,
+        "max_tokens": 800,
+    }
+
+
+def _request_tokens(request):
+    """Tokens a chat request counts against the TPM quota (prompt estimate + max_tokens)"""
+    prompt = "".join(message["content"] for message in request["messages"])
+    return estimate_tokens(prompt) + request["max_tokens"]
+
+
+_usage_lock = threading.Lock()
+_usage_totals = {"requests": 0, "input_tokens": 0, "output_tokens": 0, "transcript_tokens": 0,
+                 "compacted_tokens": 0}
+
+
+def _record_usage(request, compactions, response=None, text=None):
+    """
+    Log and total one summary request's token use: the service-reported
+    usage when the response has it, otherwise estimates from the prompt and
+    the generated `text`.
+
+    Returns:
+        {input_tokens, output_tokens, transcript_tokens}
+    """
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        input_tokens, output_tokens = usage.prompt_tokens, usage.completion_tokens
+    else:
+        if text is None:
+            text = response.choices[0].message.content or ""
+        input_tokens = _request_tokens(request) - request["max_tokens"]
+        output_tokens = estimate_tokens(text)
+    transcript_tokens = sum(info["tokens"] for info in compactions)
+    compacted_tokens = sum(info["compacted_tokens"] for info in compactions)
+
+    with _usage_lock:
+        _usage_totals["requests"] += 1
+        _usage_totals["input_tokens"] += input_tokens
+        _usage_totals["output_tokens"] += output_tokens
+        _usage_totals["transcript_tokens"] += transcript_tokens
+        _usage_totals["compacted_tokens"] += compacted_tokens
+    saved = f" (transcript {transcript_tokens} -> {compacted_tokens})" if compacted_tokens < transcript_tokens else ""
+    print(f"Summary tokens: {input_tokens} in, {output_tokens} out{saved}")
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "transcript_tokens": transcript_tokens}
+
+
+def summary_usage():
+    """Token totals over every summary request made by this process"""
+    with _usage_lock:
+        return dict(_usage_totals)
+
+
+def _summary_result(response):
+    if not response.choices or not response.choices[0].message:
+        raise ValueError("No valid response from the model.")
+
+    result = response.choices[0].message.content
+
+    result = clean_summary(result)  # Clean the summary to remove unwanted formatting
+
+    # Return the summarized content
+    return result
+
+
+def _summary_error(e):
+    """Map a summarization failure to a user-facing error"""
+    if isinstance(e, requests.exceptions.ConnectionError):
+        print(f"Network connection error: {str(e)}")
+        return Exception(f"Network connection error. Please check your internet connection and Azure OpenAI endpoint configuration.")
+    if isinstance(e, requests.exceptions.Timeout):
+        print(f"Request timeout error: {str(e)}")
+        return Exception(f"Request timed out. The Azure OpenAI service may be slow or unavailable.")
+
+    print(f"Error in summarize_transcription: {str(e)}")
+    print(f"Error type: {type(e).__name__}")
+    # Check if it's an authentication error
+    if "401" in str(e) or "unauthorized" in str(e).lower():
+        return Exception(f"Authentication error. Please check your AZURE_OPENAI_API_KEY.")
+    elif "404" in str(e):
+        return Exception(f"Service not found. Please check your AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_DEPLOYMENT.")
+    elif "429" in str(e):
+        return Exception(f"Rate limit exceeded. Please wait and try again.")
+    else:
+        return Exception(f"Azure OpenAI error: {str(e)}")
 
 
 def clean_summary(summary: str) -> str:
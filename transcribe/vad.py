@@ -0,0 +1,128 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Voice-activity settings
+FRAME_MS = 30  # analysis frame length
+SPEECH_MARGIN_DB = 10.0  # how far above the noise floor counts as speech
+MIN_SPEECH_DBFS = -50.0  # nothing quieter than this is speech, however quiet the room
+MIN_SPEECH_SECONDS = 0.3  # less voiced audio than this in a clip = no speech
+PAD_SECONDS = 0.2  # silence kept around each voiced stretch
+MAX_PAUSE_SECONDS = 1.0  # longer pauses are collapsed to this
+
+
+def frame_energy_db(audio: np.ndarray, rate: int, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """Per-frame RMS level in dBFS of mono int16 audio (trailing partial frame dropped)"""
+    frame_len = max(1, rate * frame_ms // 1000)
+    count = len(audio) // frame_len
+    frames = audio[:count * frame_len].astype(np.float32).reshape(count, frame_len) / 32768.0
+    return 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+
+
+def speech_mask(audio: np.ndarray, rate: int, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """
+    Energy-based voice activity: a frame is voiced when it is SPEECH_MARGIN_DB
+    above the clip's noise floor (its 10th-percentile frame level) and above
+    MIN_SPEECH_DBFS. Isolated voiced frames (clicks) are dropped.
+
+    Returns:
+        Boolean array, one entry per frame
+    """
+    levels = frame_energy_db(audio, rate, frame_ms)
+    if len(levels) == 0:
+        return np.zeros(0, dtype=bool)
+    threshold = max(float(np.percentile(levels, 10)) + SPEECH_MARGIN_DB, MIN_SPEECH_DBFS)
+    voiced = levels > threshold
+    # Majority vote over 3 frames removes single-frame blips
+    smoothed = np.convolve(voiced.astype(np.int8), np.ones(3, dtype=np.int8), mode="same")
+    return smoothed >= 2
+
+
+def _dilate(mask: np.ndarray, frames: int) -> np.ndarray:
+    if frames <= 0 or not mask.any():
+        return mask
+    kernel = np.ones(2 * frames + 1, dtype=np.int32)
+    return np.convolve(mask.astype(np.int32), kernel, mode="same") > 0
+
+
+def compact_speech(audio: np.ndarray, rate: int, frame_ms: int = FRAME_MS,
+                   pad_seconds: float = PAD_SECONDS,
+                   max_pause_seconds: float = MAX_PAUSE_SECONDS) -> Tuple[np.ndarray, Dict]:
+    """
+    Trim leading/trailing silence and collapse long pauses in mono int16 audio.
+
+    Voiced stretches keep `pad_seconds` of context on each side; pauses
+    between them longer than `max_pause_seconds` are shortened to that.
+
+    Returns:
+        (compacted audio, info) where info has has_speech, duration,
+        speech_seconds and kept_seconds. Without speech the audio is returned
+        untouched.
+    """
+    frame_len = max(1, rate * frame_ms // 1000)
+    voiced = speech_mask(audio, rate, frame_ms)
+    frame_seconds = frame_len / rate
+    info = {
+        "has_speech": bool(voiced.sum() * frame_seconds >= MIN_SPEECH_SECONDS),
+        "duration": round(len(audio) / rate, 3),
+        "speech_seconds": round(float(voiced.sum() * frame_seconds), 3),
+    }
+    if not info["has_speech"]:
+        info["kept_seconds"] = info["duration"]
+        return audio, info
+
+    keep = _dilate(voiced, int(round(pad_seconds / frame_seconds)))
+
+    # Inner silent runs are kept, but long ones only by their two ends
+    half_pause = int(round(max_pause_seconds / frame_seconds / 2))
+    edges = np.flatnonzero(np.diff(keep.astype(np.int8)))
+    starts = edges[keep[edges]] + 1  # first frame of each silent run
+    ends = edges[~keep[edges]] + 1  # first frame after each silent run
+    for start in starts:
+        after = ends[ends > start]
+        if len(after) == 0:
+            break  # trailing silence, dropped below
+        end = after[0]
+        if end - start > 2 * half_pause:
+            keep[start:start + half_pause] = True
+            keep[end - half_pause:end] = True
+        else:
+            keep[start:end] = True
+
+    # Expand the frame mask to samples; the partial last frame follows its frame
+    sample_keep = np.repeat(keep, frame_len)
+    if len(sample_keep) < len(audio):
+        sample_keep = np.append(sample_keep, np.full(len(audio) - len(sample_keep), keep[-1]))
+    compacted = audio[sample_keep]
+    info["kept_seconds"] = round(len(compacted) / rate, 3)
+    return compacted, info
+
+
+def split_at_silence(audio: np.ndarray, rate: int, max_chunk_seconds: float,
+                     min_chunk_seconds: Optional[float] = None,
+                     frame_ms: int = FRAME_MS) -> List[Tuple[int, int]]:
+    """
+    Split mono int16 audio into chunks of at most `max_chunk_seconds`, each
+    cut at the quietest frame in the second half of its window so words are
+    not split across chunks.
+
+    Returns:
+        (start, end) sample ranges covering the whole input, in order
+    """
+    if min_chunk_seconds is None:
+        min_chunk_seconds = max_chunk_seconds / 2
+    frame_len = max(1, rate * frame_ms // 1000)
+    max_frames = max(1, int(max_chunk_seconds * rate) // frame_len)
+    min_frames = min(max_frames, max(1, int(min_chunk_seconds * rate) // frame_len))
+    levels = frame_energy_db(audio, rate, frame_ms)
+
+    chunks = []
+    start = 0  # in frames
+    while (len(audio) - start * frame_len) > max_frames * frame_len:
+        window = levels[start + min_frames:start + max_frames]
+        cut = start + min_frames + int(np.argmin(window)) if len(window) else start + max_frames
+        chunks.append((start * frame_len, cut * frame_len))
+        start = cut
+    chunks.append((start * frame_len, len(audio)))
+    return chunks